@@ -5,7 +5,19 @@ from transformers import pipeline
 from PyPDF2 import PdfReader
 from docx import Document
 from pathlib import Path
+import argparse
+import hashlib
 import math
+import os
+import re
+import time
+
+import torch
+
+MODEL_NAME = "facebook/bart-large-cnn"
+DEFAULT_CACHE_DIR = "summary_cache"
+MODEL_WINDOW = 1024   # BART's input limit in tokens
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
 
 # Reading functions
 def read_txt(file_path):
@@ -28,50 +40,200 @@ def read_docx(file_path):
         text += para.text + "\n"
     return text
 
+# Split text into chunks that fit the model window, measured in real tokenizer tokens.
+# Whole sentences are packed greedily; only a sentence longer than the window is cut.
+def chunk_text(text, tokenizer, max_tokens):
+    sentences = [s for s in SENTENCE_END.split(" ".join(text.split())) if s]
+    if not sentences:
+        return []
+    # Counted with a leading space, as they appear inside a chunk
+    counts = [len(ids) for ids in tokenizer([" " + s for s in sentences], add_special_tokens=False)["input_ids"]]
+
+    chunks, current, current_tokens = [], [], 0
+    for sentence, count in zip(sentences, counts):
+        if count > max_tokens:
+            if current:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+            ids = tokenizer(sentence, add_special_tokens=False)["input_ids"]
+            chunks.extend(tokenizer.decode(ids[i:i+max_tokens]).strip() for i in range(0, len(ids), max_tokens))
+            continue
+        if current_tokens + count > max_tokens:
+            chunks.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(sentence)
+        current_tokens += count
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+# On-disk cache of chunk summaries, keyed by a hash of the chunk text, model name and
+# max_length/min_length, so unchanged chunks are never summarized twice.
+# Least recently used entries are evicted once the cache grows beyond max_bytes.
+class SummaryCache:
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.total_bytes = sum(os.path.getsize(path) for path in self._entries())
+
+    def _entries(self):
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                if name.endswith('.txt')]
+
+    def _path(self, chunk, model_name, max_length, min_length):
+        key = hashlib.sha256(f"{model_name}\0{max_length}\0{min_length}\0{chunk}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key + '.txt')
+
+    def get(self, chunk, model_name, max_length, min_length):
+        path = self._path(chunk, model_name, max_length, min_length)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                summary = f.read()
+        except OSError:
+            return None
+        os.utime(path)   # mark as recently used
+        return summary
+
+    def put(self, chunk, model_name, max_length, min_length, summary):
+        path = self._path(chunk, model_name, max_length, min_length)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(summary)
+        old_size = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(tmp_path, path)
+        self.total_bytes += os.path.getsize(path) - old_size
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        # Delete the least recently used entries down to 90% of max_bytes,
+        # so a full cache is not rescanned on every put
+        entries = sorted(self._entries(), key=os.path.getmtime)
+        self.total_bytes = sum(os.path.getsize(path) for path in entries)
+        for path in entries:
+            if self.total_bytes <= self.max_bytes * 0.9:
+                break
+            self.total_bytes -= os.path.getsize(path)
+            os.remove(path)
+
+# Long-lived summarizer: the model is loaded once and reused for every document
+class Summarizer:
+    def __init__(self, model_name=MODEL_NAME, batch_size=8, num_threads=None, cache=None):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.cache = cache
+        device = 0 if torch.cuda.is_available() else -1
+        if device == -1 and num_threads:
+            # CPU-only host: cap torch's threads (its default is one per physical core),
+            # e.g. when several summarizer processes share the machine
+            torch.set_num_threads(num_threads)
+            try:
+                torch.set_num_interop_threads(1)
+            except RuntimeError:
+                pass  # already set once in this process
+        self.device = device
+
+        start = time.perf_counter()
+        self.pipe = pipeline("summarization", model=model_name, device=device)
+        self.load_time = time.perf_counter() - start
+
+        tokenizer = self.pipe.tokenizer
+        window = min(tokenizer.model_max_length, MODEL_WINDOW)
+        self.max_tokens = window - tokenizer.num_special_tokens_to_add()
+
+    def chunk(self, text):
+        return chunk_text(text, self.pipe.tokenizer, self.max_tokens)
+
+    def summarize_chunks(self, chunks, max_length=150, min_length=40):
+        summaries = [None] * len(chunks)
+        if self.cache is not None:
+            summaries = [self.cache.get(chunk, self.model_name, max_length, min_length) for chunk in chunks]
+        missing = [i for i, summary in enumerate(summaries) if summary is None]
+        if self.cache is not None and len(missing) < len(chunks):
+            print(f"[+] {len(chunks) - len(missing)}/{len(chunks)} chunk summaries found in cache")
+        if missing:
+            # All uncached chunks go through the pipeline together, batch_size at a time
+            results = self.pipe([chunks[i] for i in missing], max_length=max_length, min_length=min_length,
+                                do_sample=False, truncation=True, batch_size=self.batch_size)
+            for i, result in zip(missing, results):
+                summaries[i] = result['summary_text']
+                if self.cache is not None:
+                    self.cache.put(chunks[i], self.model_name, max_length, min_length, summaries[i])
+        return summaries
+
+    def summarize(self, text, max_length=150, min_length=40, hierarchical=False):
+        chunks = self.chunk(text)
+        print(f"[+] Summarizing {len(chunks)} chunk(s) in batches of {self.batch_size}...")
+        summaries = self.summarize_chunks(chunks, max_length, min_length)
+        if not hierarchical:
+            # Combine summaries of all chunks
+            return " ".join(summaries)
+
+        # Map-reduce: re-chunk and re-summarize the summaries until one is left
+        while len(summaries) > 1:
+            chunks = self.chunk(" ".join(summaries))
+            if len(chunks) >= len(summaries):
+                break   # summaries no longer shrink (max_length too close to the window)
+            print(f"[+] Reducing {len(summaries)} summaries to {len(chunks)} chunk(s)...")
+            summaries = self.summarize_chunks(chunks, max_length, min_length)
+        return " ".join(summaries)
+
+_default_summarizer = None
+
+def get_summarizer():
+    global _default_summarizer
+    if _default_summarizer is None:
+        _default_summarizer = Summarizer(cache=SummaryCache(DEFAULT_CACHE_DIR))
+    return _default_summarizer
+
 # Summarization function with chunking for long texts
-def summarize_text(text, max_length=150, min_length=40):
-    summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
-    
-    # Split text into chunks of ~1000 tokens (roughly 750-1000 words)
-    chunks = []
-    words = text.split()
-    chunk_size = 750
-    for i in range(0, len(words), chunk_size):
-        chunk_text = " ".join(words[i:i+chunk_size])
-        chunks.append(chunk_text)
-    
-    summaries = []
-    for idx, chunk in enumerate(chunks):
-        print(f"[+] Summarizing chunk {idx+1}/{len(chunks)}...")
-        summary = summarizer(chunk, max_length=max_length, min_length=min_length, do_sample=False)
-        summaries.append(summary[0]['summary_text'])
-    
-    # Combine summaries of all chunks
-    final_summary = " ".join(summaries)
-    return final_summary
+def summarize_text(text, max_length=150, min_length=40, summarizer=None, hierarchical=False):
+    summarizer = summarizer or get_summarizer()
+    return summarizer.summarize(text, max_length=max_length, min_length=min_length, hierarchical=hierarchical)
 
-def main():
-    print("=== Document Summarization System ===")
-    file_path = input("Enter file path (TXT, PDF, DOCX): ").strip()
-    path = Path(file_path)
+# Reads any supported document, or None for an unknown format
+def read_document(path):
+    if path.suffix.lower() == ".txt":
+        return read_txt(path)
+    elif path.suffix.lower() == ".pdf":
+        return read_pdf(path)
+    elif path.suffix.lower() == ".docx":
+        return read_docx(path)
+    return None
+
+# Load time is reported on its own; throughput covers inference only
+def benchmark(paths, batch_sizes=(1, 4, 8), num_threads=None):
+    texts = [read_document(Path(p)) for p in paths]
+    texts = [text for text in texts if text]
+
+    summarizer = Summarizer(batch_size=batch_sizes[0], num_threads=num_threads)
+    num_chunks = sum(len(summarizer.chunk(text)) for text in texts)
+    print(f"Model load: {summarizer.load_time:.2f} s ({summarizer.model_name}, "
+          f"{'GPU' if summarizer.device >= 0 else f'CPU x{torch.get_num_threads()} threads'})")
+    print(f"{len(texts)} document(s), {num_chunks} chunk(s)")
+    for batch_size in batch_sizes:
+        summarizer.batch_size = batch_size
+        start = time.perf_counter()
+        for text in texts:
+            summarizer.summarize(text)
+        elapsed = time.perf_counter() - start
+        print(f"batch_size={batch_size:<3} {elapsed:8.2f} s  "
+              f"{len(texts) / elapsed:6.2f} docs/s  {num_chunks / elapsed:6.2f} chunks/s")
 
+def summarize_file(path, summarizer, hierarchical=False):
     if not path.exists():
         print("[!] File not found.")
         return
 
     # Read document based on file type
-    if path.suffix.lower() == ".txt":
-        text = read_txt(path)
-    elif path.suffix.lower() == ".pdf":
-        text = read_pdf(path)
-    elif path.suffix.lower() == ".docx":
-        text = read_docx(path)
-    else:
+    text = read_document(path)
+    if text is None:
         print("[!] Unsupported file format.")
         return
 
     print("\n[+] Generating summary...")
-    summary = summarize_text(text)
+    summary = summarize_text(text, summarizer=summarizer, hierarchical=hierarchical)
 
     # Save summary to a file in the same folder
     output_file = path.parent / f"{path.stem}_summary.txt"
@@ -82,5 +244,29 @@ def main():
     print(summary)
     print(f"\n[+] Summary saved to: {output_file.resolve()}")
 
+def main():
+    parser = argparse.ArgumentParser(description="Summarize TXT, PDF and DOCX documents.")
+    parser.add_argument("files", nargs="*", help="Documents to summarize (asked for when omitted).")
+    parser.add_argument("--batch-size", type=int, default=8, help="Chunks per inference batch.")
+    parser.add_argument("--threads", type=int, help="Cap torch threads on CPU-only hosts (default: torch's choice, one per physical core).")
+    parser.add_argument("--hierarchical", action="store_true",
+                        help="Re-summarize the chunk summaries until a single summary is left.")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_DIR, help="Directory of cached chunk summaries.")
+    parser.add_argument("--cache-mb", type=int, default=64, help="Size limit of the summary cache in MB.")
+    parser.add_argument("--no-cache", action="store_true", help="Summarize every chunk, ignoring the cache.")
+    parser.add_argument("--benchmark", action="store_true", help="Time model load and throughput on the given files.")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.files, num_threads=args.threads)
+        return
+
+    print("=== Document Summarization System ===")
+    file_paths = args.files or [input("Enter file path (TXT, PDF, DOCX): ").strip()]
+    cache = None if args.no_cache else SummaryCache(args.cache, args.cache_mb * 1024 * 1024)
+    summarizer = Summarizer(batch_size=args.batch_size, num_threads=args.threads, cache=cache)
+    for file_path in file_paths:
+        summarize_file(Path(file_path), summarizer, args.hierarchical)
+
 if __name__ == "__main__":
     main()
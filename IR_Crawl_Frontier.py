@@ -0,0 +1,314 @@
+"""
+Persistent crawl frontier and compact seen-URL sets for IR_Web_Crawler.py
+
+- normalize_url()   : one spelling per page before anything is stored
+- FingerprintSet    : 64-bit URL fingerprints in an open-addressing array (11-21 bytes/URL)
+- BloomFilter       : fixed-size bit array, ~1.2 bytes/URL at 1% false positives
+- ScalableBloomFilter : chain of BloomFilters that grows when one fills up
+- MemoryFrontier    : in-memory FIFO frontier
+- DiskFrontier      : append-only queue file + checkpoint, so a killed crawl resumes
+"""
+
+import hashlib
+import json
+import math
+import os
+import time
+from array import array
+from collections import deque
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url):
+    """Lower-cases scheme and host, drops default ports and #fragments, and uses '/' for an empty path."""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if ':' in host:
+        host = f"[{host}]"   # IPv6 literal
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    if parts.username:
+        host = parts.username + (':' + parts.password if parts.password else '') + '@' + host
+    return urlunsplit((scheme, host, parts.path or '/', parts.query, ''))
+
+
+def url_fingerprint(url):
+    """Stable 64-bit fingerprint of a (normalized) URL."""
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class FingerprintSet:
+    """Set of URLs stored only as 64-bit fingerprints in a linear-probing array('Q') table."""
+
+    def __init__(self, capacity=1024):
+        size = 1 << max(4, math.ceil(math.log2(capacity * 4 / 3)))
+        self.table = array('Q', bytes(8 * size))
+        self.count = 0
+
+    def _slot(self, fp):
+        mask = len(self.table) - 1
+        i = fp & mask
+        while self.table[i] and self.table[i] != fp:
+            i = (i + 1) & mask
+        return i
+
+    @staticmethod
+    def _fp(url):
+        return url_fingerprint(url) or 1   # 0 marks an empty slot
+
+    def __contains__(self, url):
+        return self.table[self._slot(self._fp(url))] != 0
+
+    def add(self, url):
+        fp = self._fp(url)
+        i = self._slot(fp)
+        if self.table[i]:
+            return
+        self.table[i] = fp
+        self.count += 1
+        if self.count * 4 > len(self.table) * 3:   # keep the load factor under 0.75
+            self._grow()
+
+    def _grow(self):
+        old = self.table
+        self.table = array('Q', bytes(16 * len(old)))
+        for fp in old:
+            if fp:
+                self.table[self._slot(fp)] = fp
+
+    def __len__(self):
+        return self.count
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.count.to_bytes(8, 'little'))
+            self.table.tofile(f)
+
+    @classmethod
+    def load(cls, path):
+        seen = cls()
+        with open(path, 'rb') as f:
+            seen.count = int.from_bytes(f.read(8), 'little')
+            seen.table = array('Q')
+            seen.table.frombytes(f.read())
+        return seen
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter; `url in seen` may rarely be a false positive, never a false negative."""
+
+    def __init__(self, capacity=1_000_000, error_rate=0.01):
+        self.capacity = capacity
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, url):
+        digest = hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + k * h2) % self.num_bits for k in range(self.num_hashes)]
+
+    def __contains__(self, url):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(url))
+
+    def add(self, url):
+        for p in self._positions(url):
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+    def __len__(self):
+        return self.count
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(json.dumps([self.num_bits, self.num_hashes, self.count, self.capacity]).encode() + b'\n')
+            f.write(self.bits)
+
+    @classmethod
+    def load(cls, path):
+        seen = cls.__new__(cls)
+        with open(path, 'rb') as f:
+            seen.num_bits, seen.num_hashes, seen.count, seen.capacity = json.loads(f.readline())
+            seen.bits = bytearray(f.read())
+        return seen
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that keeps its false-positive rate bounded however many URLs arrive:
+    when the newest stage holds `capacity` URLs, a stage twice as large with half the
+    error rate is added, so the total rate stays under 2 * error_rate.
+    """
+
+    def __init__(self, capacity=1_000_000, error_rate=0.01):
+        self.error_rate = error_rate
+        self.stages = [BloomFilter(capacity, error_rate / 2)]
+
+    def __contains__(self, url):
+        return any(url in stage for stage in self.stages)
+
+    def add(self, url):
+        stage = self.stages[-1]
+        if stage.count >= stage.capacity:
+            stage = BloomFilter(stage.capacity * 2, self.error_rate / 2 ** (len(self.stages) + 1))
+            self.stages.append(stage)
+        stage.add(url)
+
+    def __len__(self):
+        return sum(stage.count for stage in self.stages)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            header = [self.error_rate, [[stage.num_bits, stage.num_hashes, stage.count, stage.capacity]
+                                        for stage in self.stages]]
+            f.write(json.dumps(header).encode() + b'\n')
+            for stage in self.stages:
+                f.write(stage.bits)
+
+    @classmethod
+    def load(cls, path):
+        seen = cls.__new__(cls)
+        seen.stages = []
+        with open(path, 'rb') as f:
+            seen.error_rate, stages = json.loads(f.readline())
+            for num_bits, num_hashes, count, capacity in stages:
+                stage = BloomFilter.__new__(BloomFilter)
+                stage.num_bits, stage.num_hashes, stage.count, stage.capacity = num_bits, num_hashes, count, capacity
+                stage.bits = bytearray(f.read((num_bits + 7) // 8))
+                seen.stages.append(stage)
+        return seen
+
+
+class MemoryFrontier:
+    """In-memory FIFO frontier with the same interface as DiskFrontier."""
+
+    def __init__(self):
+        self.queue = deque()
+
+    def push(self, url, depth):
+        self.queue.append((url, depth))
+
+    def pop(self):
+        """Returns (token, url, depth), or None when nothing is queued."""
+        if not self.queue:
+            return None
+        url, depth = self.queue.popleft()
+        return None, url, depth
+
+    def done(self, token):
+        pass
+
+    def checkpoint(self, seen, full=False):
+        pass
+
+
+class DiskFrontier:
+    """
+    Append-only queue file of "depth<TAB>url" lines plus a checkpoint recording:
+    - the offset before which every entry has been fully processed,
+    - the queue length at that moment (later appends are truncated on resume),
+    - the queue length when the seen set was last saved in full.
+    Every URL enters the seen set and the queue together, so the seen set is only
+    snapshotted every snapshot_interval seconds, to seen-<queue length>.bin; on resume
+    the snapshot named by the checkpoint is loaded and the queue entries written after
+    it are replayed. A snapshot newer than the checkpoint is never used, so a kill
+    between the two writes cannot leave URLs marked seen but no longer queued.
+    Entries in flight when the process died are fetched again after a resume.
+    """
+
+    def __init__(self, directory, seen_factory=FingerprintSet, seen_capacity=1_000_000,
+                 snapshot_interval=300):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.queue_path = os.path.join(directory, 'queue.log')
+        self.checkpoint_path = os.path.join(directory, 'checkpoint.json')
+        self.seen_factory = seen_factory
+        self.seen_capacity = seen_capacity
+        self.snapshot_interval = snapshot_interval
+        self.last_snapshot = time.monotonic()
+        self.in_flight = set()     # start offsets of entries handed out but not done
+        self.resumed = os.path.exists(self.checkpoint_path)
+        read_offset, queue_size, self.seen_queue_size = 0, 0, 0
+        if self.resumed:
+            with open(self.checkpoint_path, 'r') as f:
+                state = json.load(f)
+            read_offset, queue_size = state['read_offset'], state['queue_size']
+            self.seen_queue_size = state.get('seen_queue_size', 0)
+        open(self.queue_path, 'ab').close()
+        with open(self.queue_path, 'r+b') as f:
+            f.truncate(queue_size)
+        self.writer = open(self.queue_path, 'ab')
+        self.reader = open(self.queue_path, 'rb')
+        self.reader.seek(read_offset)
+
+    def _seen_path(self, queue_size):
+        return os.path.join(self.directory, f'seen-{queue_size}.bin')
+
+    def load_seen(self):
+        """The seen set as of the last checkpoint: the last snapshot plus the URLs queued since."""
+        snapshot = self._seen_path(self.seen_queue_size)
+        if self.resumed and self.seen_queue_size and os.path.exists(snapshot):
+            seen = self.seen_factory.load(snapshot)
+        else:
+            seen, self.seen_queue_size = self.seen_factory(self.seen_capacity), 0
+        if self.resumed:
+            with open(self.queue_path, 'rb') as f:
+                f.seek(self.seen_queue_size)
+                for line in f:
+                    seen.add(line.decode('utf-8').rstrip('\n').split('\t', 1)[1])
+        return seen
+
+    def push(self, url, depth):
+        self.writer.write(f"{depth}\t{url}\n".encode('utf-8'))
+
+    def pop(self):
+        """Returns (token, url, depth), or None when nothing is queued."""
+        self.writer.flush()
+        start = self.reader.tell()
+        line = self.reader.readline()
+        if not line.endswith(b'\n'):
+            self.reader.seek(start)
+            return None
+        depth, url = line.decode('utf-8').rstrip('\n').split('\t', 1)
+        self.in_flight.add(start)
+        return start, url, int(depth)
+
+    def done(self, token):
+        self.in_flight.discard(token)
+
+    def checkpoint(self, seen, full=False):
+        """
+        Atomically records progress; everything before the oldest in-flight entry is done.
+        The seen set is rewritten only when full or every snapshot_interval seconds.
+        """
+        self.writer.flush()
+        os.fsync(self.writer.fileno())
+        seen_queue_size = self.seen_queue_size
+        snapshot_taken = full or time.monotonic() - self.last_snapshot >= self.snapshot_interval
+        if snapshot_taken:
+            seen_queue_size = self.writer.tell()
+            snapshot = self._seen_path(seen_queue_size)
+            seen.save(snapshot + '.tmp')
+            os.replace(snapshot + '.tmp', snapshot)
+            self.last_snapshot = time.monotonic()
+        state = {'read_offset': min(self.in_flight, default=self.reader.tell()),
+                 'queue_size': self.writer.tell(),
+                 'seen_queue_size': seen_queue_size}
+        with open(self.checkpoint_path + '.tmp', 'w') as f:
+            json.dump(state, f)
+        os.replace(self.checkpoint_path + '.tmp', self.checkpoint_path)
+        if snapshot_taken:
+            # The checkpoint now names the new snapshot; older ones can go
+            self.seen_queue_size = seen_queue_size
+            keep = os.path.basename(self._seen_path(seen_queue_size))
+            for name in os.listdir(self.directory):
+                if name.startswith('seen-') and name.endswith('.bin') and name != keep:
+                    os.remove(os.path.join(self.directory, name))
+
+    def close(self):
+        self.writer.close()
+        self.reader.close()
@@ -0,0 +1,141 @@
+"""
+Pooled HTTP session with a persistent conditional-GET cache,
+shared by IR_Web_Crawler.py and IR_Web_Scrapper.py.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def make_session(pool_size=32, headers=None):
+    """A requests.Session that keeps up to pool_size keep-alive connections per host."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+class CachedSession:
+    """
+    Wraps a pooled session with an on-disk response cache keyed by URL.
+    Responses carrying an ETag or Last-Modified header are stored; the next GET of the
+    same URL sends If-None-Match / If-Modified-Since, and a 304 answer is turned back
+    into a normal 200 response built from the cached body.
+    """
+
+    def __init__(self, cache_dir='http_cache', session=None, pool_size=32, headers=None):
+        self.cache_dir = cache_dir
+        self.session = session or make_session(pool_size, headers)
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'revalidated': 0, 'bytes_downloaded': 0, 'bytes_saved': 0}
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + '.json'), os.path.join(self.cache_dir, key + '.body')
+
+    def _write_atomic(self, path, data):
+        """Writes via a unique temp file and os.replace, so readers never see a partial file."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def _count(self, **deltas):
+        with self._lock:
+            for name, delta in deltas.items():
+                self.stats[name] += delta
+
+    def get(self, url, **kwargs):
+        meta_path, body_path = self._paths(url)
+        meta = None
+        if os.path.exists(meta_path) and os.path.exists(body_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            headers = dict(kwargs.pop('headers', None) or {})
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+            kwargs['headers'] = headers
+
+        response = self.session.get(url, **kwargs)
+
+        if response.status_code == 304 and meta is not None:
+            with open(body_path, 'rb') as f:
+                body = f.read()
+            self._count(requests=1, revalidated=1, bytes_saved=len(body))
+            cached = requests.Response()
+            cached.status_code = 200
+            cached.url = meta['url']
+            cached.headers.update(meta['headers'])
+            cached.encoding = meta['encoding']
+            cached._content = body
+            cached.request = response.request
+            return cached
+
+        self._count(requests=1, bytes_downloaded=len(response.content))
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code == 200 and (etag or last_modified):
+            # Drop the old validators first: a run killed mid-update then leaves no
+            # entry rather than a new body paired with the old ETag (or vice versa)
+            try:
+                os.remove(meta_path)
+            except FileNotFoundError:
+                pass
+            self._write_atomic(body_path, response.content)
+            meta = {'url': response.url, 'etag': etag, 'last_modified': last_modified,
+                    'encoding': response.encoding, 'headers': dict(response.headers)}
+            self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+        return response
+
+    def report(self):
+        """One-line summary of cache effectiveness."""
+        s = self.stats
+        hit_rate = s['revalidated'] / s['requests'] if s['requests'] else 0.0
+        return (f"HTTP cache: {s['requests']} requests, {s['revalidated']} served from cache "
+                f"({hit_rate:.0%} hit rate), {s['bytes_downloaded']} bytes downloaded, "
+                f"{s['bytes_saved']} bytes saved")
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter: `rate` requests per second on average,
+    with bursts of up to `capacity`. Call acquire() right before each request.
+    """
+
+    def __init__(self, rate, capacity=1):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("TokenBucket needs rate > 0 and capacity >= 1")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
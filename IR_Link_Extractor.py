@@ -0,0 +1,150 @@
+"""
+Pluggable link extractors for IR_Web_Crawler.py
+
+Every extractor takes (page_url, body bytes, encoding) and returns the absolute URLs
+of all <a href> links, resolved against <base href> when the page has one.
+- "lxml"       : lxml's HTML parser with a target object, so no tree is built
+- "htmlparser" : the standard library html.parser.HTMLParser, fed incrementally
+- "bs4"        : the original BeautifulSoup(...).find_all('a', href=True) approach
+"""
+
+import argparse
+import codecs
+import os
+import time
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+
+class _HrefCollector:
+    """Collects <base href> and <a href> values; used by both streaming extractors."""
+
+    def __init__(self):
+        self.base = None
+        self.hrefs = []
+
+    def start(self, tag, attrs):
+        tag = tag.lower()
+        if tag == 'a':
+            href = attrs.get('href')
+            if href is not None:
+                self.hrefs.append(href.strip())
+        elif tag == 'base' and self.base is None:
+            href = attrs.get('href')
+            if href:
+                self.base = href.strip()
+
+    def links(self, page_url):
+        base = urljoin(page_url, self.base) if self.base else page_url
+        return [urljoin(base, href) for href in self.hrefs]
+
+    # lxml target interface
+    def end(self, tag):
+        pass
+
+    def data(self, data):
+        pass
+
+    def close(self):
+        return self
+
+
+class _StreamingParser(HTMLParser):
+    def __init__(self, collector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('a', 'base'):
+            self.collector.start(tag, {name: value for name, value in attrs if value is not None})
+
+    handle_startendtag = handle_starttag
+
+
+def known_encoding(encoding):
+    """The encoding if Python knows it, else None (unknown or misspelled charset header)."""
+    if not encoding:
+        return None
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        return None
+    return encoding
+
+
+def extract_links_htmlparser(page_url, body, encoding=None, chunk_size=64 * 1024):
+    """Streams the bytes through html.parser, decoding them chunk by chunk."""
+    collector = _HrefCollector()
+    parser = _StreamingParser(collector)
+    decoder = codecs.getincrementaldecoder(known_encoding(encoding) or 'utf-8')(errors='replace')
+    for start in range(0, len(body), chunk_size):
+        parser.feed(decoder.decode(body[start:start + chunk_size]))
+    parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+    return collector.links(page_url)
+
+
+def extract_links_lxml(page_url, body, encoding=None):
+    """Parses the bytes with lxml, calling back on start tags instead of building a tree."""
+    collector = _HrefCollector()
+    # No charset: let lxml detect it; an unknown one: utf-8, like extract_links_htmlparser
+    encoding = known_encoding(encoding) or ('utf-8' if encoding else None)
+    try:
+        parser = etree.HTMLParser(target=collector, encoding=encoding)
+    except LookupError:
+        parser = etree.HTMLParser(target=collector, encoding='utf-8')   # known to Python but not libxml2
+    parser.feed(body)
+    parser.close()
+    return collector.links(page_url)
+
+
+def extract_links_bs4(page_url, body, encoding=None):
+    """Builds a full BeautifulSoup tree, as the crawler originally did."""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(body, 'html.parser', from_encoding=encoding)
+    base_tag = soup.find('base', href=True)
+    base = urljoin(page_url, base_tag['href'].strip()) if base_tag else page_url
+    return [urljoin(base, link['href'].strip()) for link in soup.find_all('a', href=True)]
+
+
+EXTRACTORS = {'htmlparser': extract_links_htmlparser, 'bs4': extract_links_bs4}
+if etree is not None:
+    EXTRACTORS['lxml'] = extract_links_lxml
+DEFAULT_EXTRACTOR = 'lxml' if etree is not None else 'htmlparser'
+
+
+def benchmark(corpus_dir, repeat=3):
+    """Times every extractor over the .html files in corpus_dir and checks they find the same links."""
+    pages = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.endswith(('.html', '.htm')):
+            with open(os.path.join(corpus_dir, name), 'rb') as f:
+                pages.append(('http://example.com/' + name, f.read()))
+    total_bytes = sum(len(body) for _, body in pages)
+    print(f"{len(pages)} pages, {total_bytes / 1e6:.1f} MB")
+
+    reference = None
+    for name, extract in EXTRACTORS.items():
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = [extract(url, body) for url, body in pages]
+            best = min(best, time.perf_counter() - start)
+        if reference is None:
+            reference = results
+        mismatches = sum(set(a) != set(b) for a, b in zip(results, reference))
+        print(f"{name:>10}: {best:.3f} s, {len(pages) / best:.0f} pages/s, "
+              f"{total_bytes / best / 1e6:.1f} MB/s, {mismatches} pages differ from htmlparser")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark link extractors on saved HTML pages.")
+    parser.add_argument("corpus_dir", help="Directory of saved .html pages (e.g. from IR_Web_Crawler.py --save-pages).")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    benchmark(args.corpus_dir, args.repeat)
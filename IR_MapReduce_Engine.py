@@ -0,0 +1,145 @@
+"""
+Disk-spilling MapReduce engine
+
+mapper(record)            -> iterable of (key, value)
+combiner(key, values)     -> one value, applied map-side and while merging (optional)
+reducer(key, values)      -> final value for the key; values is an iterator
+
+Intermediate pairs are hash-partitioned into num_partitions buffers. A buffer
+holding more than memory_budget values is sorted and spilled to a run file;
+each partition is finished with a k-way merge of its runs, so memory depends
+on the budget rather than on the number of input records. At most max_fan_in
+runs are opened at once: larger run sets are first merged in passes into
+fewer, longer runs.
+"""
+
+import heapq
+import os
+import pickle
+import tempfile
+import zlib
+from itertools import groupby
+from operator import itemgetter
+
+
+def partition_of(key, num_partitions):
+    """Stable hash partitioning (built-in hash() of str changes between runs)."""
+    return zlib.crc32(repr(key).encode('utf-8')) % num_partitions
+
+
+def read_run(path):
+    """Yields the (key, values) pairs of one sorted run file."""
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+class MapReduceJob:
+    def __init__(self, mapper, reducer, combiner=None, num_partitions=4,
+                 memory_budget=500_000, tmp_dir=None, max_fan_in=64):
+        self.mapper = mapper
+        self.reducer = reducer
+        self.combiner = combiner
+        self.num_partitions = num_partitions
+        self.memory_budget = memory_budget  # max buffered values per partition
+        self.tmp_dir = tmp_dir
+        self.max_fan_in = max(2, max_fan_in)  # run files open at once while merging
+        self.spill_count = 0
+
+    def _add(self, buffer, key, value):
+        """Buffers one pair and returns how many values the buffer grew by."""
+        if key not in buffer:
+            buffer[key] = [value]
+            return 1
+        if self.combiner is not None:
+            # Map-side combine: one value per distinct key stays in memory
+            buffer[key][0] = self.combiner(key, [buffer[key][0], value])
+            return 0
+        buffer[key].append(value)
+        return 1
+
+    def _spill(self, buffer, run_dir, partition):
+        """Writes a buffer to a new run file sorted by key."""
+        path = os.path.join(run_dir, f"part{partition}-run{self.spill_count}.pkl")
+        self.spill_count += 1
+        with open(path, 'wb') as f:
+            for item in sorted(buffer.items(), key=itemgetter(0)):
+                pickle.dump(item, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return path
+
+    def _merged_groups(self, sources):
+        """
+        k-way merges sorted (key, values) sources and yields (key, chunks) per key.
+        With a combiner every key's chunks are folded into one value as they stream by.
+        """
+        merged = heapq.merge(*sources, key=itemgetter(0))
+        for key, group in groupby(merged, key=itemgetter(0)):
+            if self.combiner is None:
+                yield key, (chunk for _, chunk in group)
+            else:
+                _, (value, *rest) = next(group)
+                for _, chunk in group:
+                    value = self.combiner(key, [value, *chunk])
+                if rest:
+                    value = self.combiner(key, [value, *rest])
+                yield key, iter([[value]])
+
+    def _merge_pass(self, runs, run_dir, partition):
+        """Merges runs max_fan_in at a time into new run files until few enough remain."""
+        while len(runs) > self.max_fan_in:
+            merged_runs = []
+            for start in range(0, len(runs), self.max_fan_in):
+                group = runs[start:start + self.max_fan_in]
+                if len(group) == 1:
+                    merged_runs.append(group[0])
+                    continue
+                path = os.path.join(run_dir, f"part{partition}-run{self.spill_count}.pkl")
+                self.spill_count += 1
+                with open(path, 'wb') as f:
+                    for key, chunks in self._merged_groups([read_run(run) for run in group]):
+                        # Chunks are copied one by one, so a hot key never has to fit in memory
+                        for chunk in chunks:
+                            pickle.dump((key, chunk), f, protocol=pickle.HIGHEST_PROTOCOL)
+                for run in group:
+                    os.remove(run)
+                merged_runs.append(path)
+            runs = merged_runs
+        return runs
+
+    def _merge(self, runs, buffer, run_dir, partition):
+        """k-way merges the spilled runs with the in-memory buffer of one partition."""
+        sources = [read_run(path) for path in self._merge_pass(runs, run_dir, partition)]
+        sources.append(iter(sorted(buffer.items(), key=itemgetter(0))))
+        for key, chunks in self._merged_groups(sources):
+            # The reducer gets an iterator, so a hot key's values are streamed, not listed
+            yield key, self.reducer(key, (value for chunk in chunks for value in chunk))
+
+    def run(self, records):
+        """Runs the job over an iterable of input records.
+
+        Yields (key, result) pairs, partition by partition and sorted by key
+        within each partition.
+        """
+        buffers = [{} for _ in range(self.num_partitions)]
+        sizes = [0] * self.num_partitions
+        runs = [[] for _ in range(self.num_partitions)]
+        self.spill_count = 0
+
+        with tempfile.TemporaryDirectory(dir=self.tmp_dir, prefix="mapreduce-") as run_dir:
+            # Map (+ combine) and spill
+            for record in records:
+                for key, value in self.mapper(record):
+                    p = partition_of(key, self.num_partitions)
+                    sizes[p] += self._add(buffers[p], key, value)
+                    if sizes[p] > self.memory_budget:
+                        runs[p].append(self._spill(buffers[p], run_dir, p))
+                        buffers[p] = {}
+                        sizes[p] = 0
+
+            # Merge and reduce, one partition at a time
+            for p in range(self.num_partitions):
+                buffer, buffers[p] = buffers[p], None
+                yield from self._merge(runs[p], buffer, run_dir, p)
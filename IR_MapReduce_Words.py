@@ -1,21 +1,36 @@
-from functools import reduce
+import argparse
+
+from IR_MapReduce_Engine import MapReduceJob
 
 text ='''Once upon a time in a dense forest, a lion ruled proudly over the land. Every morning, the birds sang while the deer grazed near the river. One curious monkey loved to swing from tree to tree, teasing the sleepy tiger below. The elephant marched slowly through the woods, shaking the ground with each step. A clever fox watched everything from a distance, waiting for a chance to steal some fruit. As the sun set, the owl hooted softly, and all the animals returned to their homes. The jungle was peaceful once more, until the next adventure began.'''
 
 
-words = text.split()
-mapped = list(map(lambda w: (w, 1), words))
-print("Mapped:", mapped)
-shuffle_sort = {}
-for word, count in mapped:
-    if word in shuffle_sort:
-        shuffle_sort[word].append(count)
-    else:
-        shuffle_sort[word] = [count]
+def word_mapper(line):
+    """Map: emits (word, 1) for every word in a line."""
+    for word in line.split():
+        yield word, 1
+
 
-print("Shuffled:", shuffle_sort)
+def sum_counts(word, counts):
+    """Combine / Reduce: adds up the counts of one word."""
+    return sum(counts)
 
-reduced = {word: reduce(lambda a, b: a + b, counts) for word, counts in shuffle_sort.items()}
 
-print("Word counts:", reduced)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Word count with the disk-spilling MapReduce engine.")
+    parser.add_argument("filepath", nargs="?", help="Text file to count (default: the built-in story).")
+    parser.add_argument("--partitions", type=int, default=4, help="Number of reducer partitions.")
+    parser.add_argument("--memory-budget", type=int, default=500_000,
+                        help="Buffered values per partition before spilling a sorted run to disk.")
+    args = parser.parse_args()
 
+    job = MapReduceJob(word_mapper, sum_counts, combiner=sum_counts,
+                       num_partitions=args.partitions, memory_budget=args.memory_budget)
+
+    if args.filepath is None:
+        print("Word counts:", dict(job.run(text.splitlines())))
+    else:
+        # Lines are streamed from disk, never loaded all at once
+        with open(args.filepath, 'r', encoding='utf-8', errors='replace') as f:
+            for word, count in job.run(f):
+                print(f"{word}\t{count}")
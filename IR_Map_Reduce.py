@@ -1,11 +1,67 @@
 import argparse
+import glob
+import gzip
+import mmap
+import os
+import re
+import string
 from collections import Counter
+from functools import partial
 from multiprocessing import Pool, cpu_count
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Bytes decoded at a time inside one mapped range, so worker memory stays flat.
+BLOCK_SIZE = 4 * 1024 * 1024
+# Smallest unit of work in a multi-file job; smaller files are batched together.
+MIN_TASK_BYTES = 1024 * 1024
+
+# 256-entry byte table: ASCII upper case folded to lower case, every other byte unchanged.
+LOWER_TABLE = bytes.maketrans(string.ascii_uppercase.encode(), string.ascii_lowercase.encode())
+NON_ASCII_BYTES = bytes(range(128, 256))
+NON_ASCII_RUN = re.compile(rb'[\x80-\xff]+')
+ASCII_LETTERS = string.ascii_lowercase.encode()
+
+BACKENDS = ["unicode", "bytes", "numpy"]
+DEFAULT_BACKEND = "numpy" if np is not None else "bytes"
+
 def mapper(chunk):
     """Counts characters in a chunk of text."""
     return Counter(c for c in chunk.lower() if c.isalpha())
 
+def count_letters(data, backend=DEFAULT_BACKEND):
+    """Counts letters in UTF-8 bytes, tallying the ASCII part a whole chunk at a time.
+
+    Only runs of non-ASCII bytes are decoded and sent through the Unicode mapper;
+    the "unicode" backend decodes everything and is kept for cross-checking.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    if backend == "unicode":
+        return mapper(data.decode('utf-8', errors='replace'))
+    counts = Counter()
+    if not data.isascii():
+        for run in NON_ASCII_RUN.findall(data):
+            counts.update(mapper(run.decode('utf-8', errors='replace')))
+        data = data.translate(None, NON_ASCII_BYTES)
+    data = data.translate(LOWER_TABLE)
+    if backend == "numpy":
+        tally = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+        ascii_counts = {chr(b): int(tally[b]) for b in ASCII_LETTERS}
+    else:
+        ascii_counts = {chr(b): data.count(b) for b in ASCII_LETTERS}
+    counts.update({letter: n for letter, n in ascii_counts.items() if n})
+    return counts
+
+def text_mapper(chunk, backend=DEFAULT_BACKEND):
+    """Counts characters in a chunk of text with the chosen backend."""
+    if backend == "unicode":
+        return mapper(chunk)
+    return count_letters(chunk.encode('utf-8'), backend)
+
 def reducer(counts_list):
     """Merges all counters into a single one."""
     result = Counter()
@@ -13,42 +69,215 @@ def reducer(counts_list):
         result.update(counts)
     return result
 
+def tree_reducer(counts_iter):
+    """Merges counters pairwise as they arrive, like a binary counter of partial sums.
+
+    Each incoming result is merged with an equal-sized partial sum, so the reduce
+    runs while the mappers are still working instead of after the last one.
+    """
+    stack = []  # (level, Counter) pairs, levels strictly decreasing towards the top
+    for counts in counts_iter:
+        level = 0
+        while stack and stack[-1][0] == level:
+            _, partial_sum = stack.pop()
+            partial_sum.update(counts)
+            counts = partial_sum
+            level += 1
+        stack.append((level, counts))
+    return reducer(counts for _, counts in stack)
+
+def utf8_boundary(buf, pos):
+    """Moves pos forward past UTF-8 continuation bytes to the next character start."""
+    while pos < len(buf) and (buf[pos] & 0xC0) == 0x80:
+        pos += 1
+    return pos
+
+def byte_ranges(filepath, num_chunks):
+    """Splits a file into (start, end) byte ranges aligned to UTF-8 character boundaries."""
+    size = os.path.getsize(filepath)
+    if size == 0:
+        return []
+    step = max(1, size // num_chunks)
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        bounds = [0]
+        for pos in range(step, size, step):
+            pos = utf8_boundary(mm, pos)
+            if pos > bounds[-1] and pos < size:
+                bounds.append(pos)
+        bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+def range_mapper(task):
+    """Counts characters in one byte range of a memory-mapped file."""
+    filepath, start, end, backend = task
+    counts = Counter()
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos < end:
+            stop = min(end, utf8_boundary(mm, pos + BLOCK_SIZE))
+            counts.update(count_letters(mm[pos:stop], backend))
+            pos = stop
+    return counts
+
+def expand_inputs(paths):
+    """Expands files, directories (recursively) and glob patterns into a sorted list of files."""
+    files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.update(os.path.join(root, name) for name in names)
+        elif os.path.isfile(path):
+            files.add(path)
+        else:
+            matches = [m for m in glob.glob(path, recursive=True) if os.path.isfile(m)]
+            if not matches:
+                raise FileNotFoundError(path)
+            files.update(matches)
+    return sorted(files)
+
+def plan_tasks(files, num_chunks):
+    """Splits large files into byte ranges and batches small files into tasks of similar size.
+
+    Each task is a list of (filepath, start, end) segments; gzip files cannot be
+    split, so they are always one segment with start = end = None.
+    """
+    sizes = {path: os.path.getsize(path) for path in files}
+    target = max(MIN_TASK_BYTES, sum(sizes.values()) // num_chunks)
+
+    segments = []
+    for path in files:
+        if sizes[path] == 0:
+            continue
+        if path.endswith('.gz'):
+            segments.append((sizes[path], (path, None, None)))
+        else:
+            pieces = -(-sizes[path] // target)  # ceil division
+            for start, end in byte_ranges(path, pieces):
+                segments.append((end - start, (path, start, end)))
+
+    # Largest segments first, small ones packed together until a task reaches the target
+    segments.sort(key=lambda item: item[0], reverse=True)
+    tasks, current, current_size = [], [], 0
+    for size, segment in segments:
+        if size >= target:
+            tasks.append([segment])
+            continue
+        current.append(segment)
+        current_size += size
+        if current_size >= target:
+            tasks.append(current)
+            current, current_size = [], 0
+    if current:
+        tasks.append(current)
+    return tasks
+
+def gzip_mapper(filepath, backend=DEFAULT_BACKEND):
+    """Counts characters in a gzip-compressed text file, decompressing block by block."""
+    counts = Counter()
+    with gzip.open(filepath, 'rt', encoding='utf-8', errors='replace') as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), ''):
+            counts.update(text_mapper(block, backend))
+    return counts
+
+def batch_mapper(task):
+    """Counts characters in every segment of a task; returns [(filepath, Counter), ...]."""
+    segments, backend = task
+    results = []
+    for filepath, start, end in segments:
+        if start is None:
+            results.append((filepath, gzip_mapper(filepath, backend)))
+        else:
+            results.append((filepath, range_mapper((filepath, start, end, backend))))
+    return results
+
+def print_counts(title, counts):
+    """Prints letter counts sorted by letter."""
+    print(title)
+    for letter, count in sorted(counts.items()):
+        print(f"{letter}: {count}")
+
 if __name__ == "__main__":
     # Set up command-line argument parser
-    parser = argparse.ArgumentParser(description="Count letter occurrences in a text file using MapReduce.")
-    parser.add_argument("filepath", help="The path to the input text file.")
+    parser = argparse.ArgumentParser(description="Count letter occurrences in text files using MapReduce.")
+    parser.add_argument("paths", nargs="+", metavar="filepath",
+                        help="Input text files, directories, glob patterns or .gz files.")
+    parser.add_argument("--mmap", action="store_true",
+                        help="Send only byte ranges to the workers and let each one memory-map its own range.")
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help="Letter counting engine (default: %(default)s).")
+    parser.add_argument("--chunks-per-worker", type=int, default=16,
+                        help="Split the input into this many chunks per worker so stragglers stay small.")
     args = parser.parse_args()
+    if args.backend == "numpy" and np is None:
+        print("Error: the numpy backend needs numpy installed.")
+        exit(1)
+    num_workers = cpu_count()
+    num_chunks = num_workers * max(1, args.chunks_per_worker)
 
-    # Read data from the specified file
     try:
-        with open(args.filepath, 'r', encoding='utf-8') as f:
-            data = f.read()
-    except FileNotFoundError:
-        print(f"Error: The file '{args.filepath}' was not found.")
+        files = expand_inputs(args.paths)
+    except FileNotFoundError as e:
+        print(f"Error: The file '{e}' was not found.")
         exit(1)
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        exit(1)
-        
-    if not data:
-        print("The file is empty. Nothing to process.")
-        exit(0)
 
-    # Split into chunks for parallel processing
-    num_workers = cpu_count()
-    chunk_size = len(data) // num_workers or 1
-    chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+    if args.mmap or len(files) != 1 or files[0].endswith('.gz'):
+        # Only byte offsets are computed here; the text itself never enters the parent.
+        try:
+            tasks = plan_tasks(files, num_chunks)
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            exit(1)
 
-    # Map step (parallel)
-    with Pool(processes=num_workers) as pool:
-        mapped_counts = pool.map(mapper, chunks)
+        if not tasks:
+            print("The input is empty. Nothing to process.")
+            exit(0)
 
-    # Reduce step
-    final_counts = reducer(mapped_counts)
+        # Map and reduce overlap: results are merged in completion order
+        per_file = {path: Counter() for path in files}
 
-    # Print results (sorted by letter)
-    print(f"Character counts for '{args.filepath}':")
-    for letter, count in sorted(final_counts.items()):
-        print(f"{letter}: {count}")
+        def task_totals(results):
+            for file_counts in results:
+                task_total = Counter()
+                for path, counts in file_counts:
+                    per_file[path].update(counts)
+                    task_total.update(counts)
+                yield task_total
+
+        with Pool(processes=num_workers) as pool:
+            mapped = pool.imap_unordered(batch_mapper, ((segments, args.backend) for segments in tasks))
+            final_counts = tree_reducer(task_totals(mapped))
+
+        if len(files) > 1:
+            for path in files:
+                print_counts(f"Character counts for '{path}':", per_file[path])
+                print()
+            print_counts(f"Total character counts for {len(files)} files:", final_counts)
+        else:
+            print_counts(f"Character counts for '{files[0]}':", final_counts)
+    else:
+        # Read data from the specified file
+        filepath = files[0]
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = f.read()
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            exit(1)
+
+        if not data:
+            print("The file is empty. Nothing to process.")
+            exit(0)
+
+        # Split into chunks for parallel processing
+        chunk_size = len(data) // num_chunks or 1
+        chunks = (data[i:i + chunk_size] for i in range(0, len(data), chunk_size))
+
+        # Map step (parallel) with the reduce step merging results as they finish
+        with Pool(processes=num_workers) as pool:
+            final_counts = tree_reducer(pool.imap_unordered(partial(text_mapper, backend=args.backend), chunks))
+
+        print_counts(f"Character counts for '{filepath}':", final_counts)
         
 # python "C:\Users\dande\Downloads\LPIV\IR_Map_Reduce.py" "C:\Users\dande\Downloads\LPIV\mapreduceinput.txt"
+# python "C:\Users\dande\Downloads\LPIV\IR_Map_Reduce.py" --mmap "C:\Users\dande\Downloads\LPIV\mapreduceinput.txt"
+# python "C:\Users\dande\Downloads\LPIV\IR_Map_Reduce.py" "C:\Users\dande\Downloads\LPIV\logs" "C:\Users\dande\Downloads\LPIV\*.txt.gz"
@@ -1,16 +1,23 @@
 # MapReduce Program to count occurrences of each alphabet character
 
 # Import required modules
+import sys                                    # Optional backend argument
 from multiprocessing import Pool, cpu_count   # For parallel processing (Map step)
 from collections import Counter               # For counting occurrences easily
+from functools import partial                 # To pass the chosen backend to every mapper
+from IR_Map_Reduce import count_letters, BACKENDS, DEFAULT_BACKEND   # Byte-level counting engine
 
 # ---------- Mapper Function ----------
-def mapper(text_chunk):
+def mapper(text_chunk, backend="unicode"):
     """
     Mapper function:
     Takes a chunk of text and returns a Counter (dictionary-like object)
     that counts how many times each alphabet letter appears in that chunk.
+    With backend "bytes" or "numpy" the chunk is counted on its raw UTF-8
+    bytes by count_letters(), which gives the same result much faster.
     """
+    if backend != "unicode":
+        return count_letters(text_chunk.encode('utf-8'), backend)
     # Convert text to lowercase, keep only alphabets (ignore digits/symbols)
     return Counter(c for c in text_chunk.lower() if c.isalpha())
 
@@ -32,6 +39,12 @@ def reducer(counts_list):
 # ---------- Main Program ----------
 if __name__ == "__main__":
 
+    # Counting engine: optional first argument (unicode/bytes/numpy), else the fast default
+    backend = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        print(f"Error: unknown backend '{backend}' (choose from {', '.join(BACKENDS)}).")
+        exit(1)
+
     # Step 1: Read input file path from user
     file_path = input("Enter path of the input text file: ").strip()
 
@@ -61,7 +74,7 @@ if __name__ == "__main__":
     # Create a pool of worker processes equal to CPU count
     with Pool(processes=num_workers) as pool:
         # Each process runs the mapper() on one chunk
-        mapped_results = pool.map(mapper, chunks)
+        mapped_results = pool.map(partial(mapper, backend=backend), chunks)
 
     # ---------- Reduce Step ----------
     # Combine (reduce) all partial counts from mapper results
@@ -2,6 +2,14 @@ import math          # For mathematical operations like sqrt and acos
 import string        # For string constants (punctuation, uppercase letters, etc.)
 import sys           # For system exit if file read fails
 import re
+import argparse      # For command-line options (pairwise / index / query modes)
+import glob          # For expanding corpus file patterns
+import heapq         # For picking the top-k results
+import os
+import pickle        # For saving and loading the inverted index and LSH signatures
+import zlib          # Stable shingle hashes for MinHash
+import hashlib       # Content hashes for the frequency cache
+import json
 
 # ---------- Function: Read file ----------
 def read_file(filename):
@@ -49,10 +57,57 @@ def get_words_from_line_list(text):
     
     # 2. Use re.findall to find all sequences of one or more letters/digits
     # This automatically ignores punctuation and splits the words.
-    word_list = re.findall(r'\b[a-z0-9]+\b', text)
+    word_list = WORD_PATTERN.findall(text)
     
     return word_list
 
+
+# Tokenizer settings; part of the frequency cache key, so changing them invalidates old entries
+WORD_PATTERN = re.compile(r'\b[a-z0-9]+\b')
+BLOCK_SIZE = 1 << 20   # characters read at a time by the streaming tokenizer
+WORD_RUN_TAIL = re.compile(r'\w+\Z')
+WORD_RUN_HEAD = re.compile(r'\w*')
+
+
+# ---------- Function: Stream words from a file ----------
+def iter_words_from_file(filename, block_size=BLOCK_SIZE, stats=None):
+    """
+    Yields the same words as get_words_from_line_list(read_file(filename)), reading
+    block_size characters at a time. A word-character run at the end of a block is held
+    back and joined to the next block, so words spanning block edges stay whole.
+    A run longer than block_size is dropped rather than held (it is skipped up to the
+    next separator), which keeps memory bounded on input without separators.
+    If a stats dict is given, stats['characters'] is set to the number of characters read.
+    """
+    carry = ''
+    skipping = False   # inside an oversized run that is being dropped
+    characters = 0
+    try:
+        with open(filename, 'r') as f:
+            while True:
+                block = f.read(block_size)
+                if not block:
+                    break
+                characters += len(block)
+                text = block.lower()
+                if skipping:
+                    start = WORD_RUN_HEAD.match(text).end()
+                    skipping = start == len(text)
+                    text = text[start:]
+                text = carry + text
+                tail = WORD_RUN_TAIL.search(text)
+                cut = tail.start() if tail else len(text)
+                carry = text[cut:]
+                if len(carry) > block_size:
+                    carry, skipping = '', True
+                yield from WORD_PATTERN.findall(text, 0, cut)
+    except IOError:
+        print("Error opening or reading input file:", filename)
+        sys.exit()
+    yield from WORD_PATTERN.findall(carry)
+    if stats is not None:
+        stats['characters'] = characters
+
 # ---------- Function: Count frequency of each word ----------
 def count_frequency(word_list):
     """
@@ -68,19 +123,120 @@ def count_frequency(word_list):
     return D
 
 
+# ---------- Class: On-disk frequency cache ----------
+class FrequencyCache:
+    """
+    Caches word-frequency results on disk, keyed by a hash of the file's content and
+    the tokenizer settings, so the same text is tokenized only once wherever it lives.
+    A small (path, size, mtime) -> content hash table lets unchanged files skip even
+    the hashing read; it is kept in memory and written by flush(). Once there are more
+    than max_entries, the least recently used entries are evicted down to 90% of it.
+    """
+
+    def __init__(self, directory, max_entries=1000):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+        self.stat_path = os.path.join(directory, 'stat_index.json')
+        try:
+            with open(self.stat_path, 'r') as f:
+                self.stat_index = json.load(f)
+        except (IOError, ValueError):
+            self.stat_index = {}
+        self.stat_dirty = False
+        self.num_entries = len(self._entries())
+
+    def _entries(self):
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                if name.endswith('.pkl')]
+
+    def content_key(self, filename):
+        """Hash of the file content plus tokenizer settings."""
+        st = os.stat(filename)
+        stat_key = "%s|%d|%d" % (os.path.abspath(filename), st.st_size, st.st_mtime_ns)
+        if stat_key not in self.stat_index:
+            digest = hashlib.sha256()
+            with open(filename, 'rb') as f:
+                for chunk in iter(lambda: f.read(BLOCK_SIZE), b''):
+                    digest.update(chunk)
+            self.stat_index[stat_key] = digest.hexdigest()
+            self.stat_dirty = True
+        settings = hashlib.sha256(WORD_PATTERN.pattern.encode()).hexdigest()[:16]
+        return self.stat_index[stat_key] + "-" + settings
+
+    def get(self, filename):
+        """Returns the cached (freq_mapping, characters, words) or None."""
+        path = os.path.join(self.directory, self.content_key(filename) + '.pkl')
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except (IOError, EOFError, pickle.UnpicklingError):
+            return None
+        os.utime(path)   # mark as recently used
+        return entry
+
+    def put(self, filename, entry):
+        path = os.path.join(self.directory, self.content_key(filename) + '.pkl')
+        is_new = not os.path.exists(path)
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+        if is_new:
+            self.num_entries += 1
+            if self.num_entries > self.max_entries:
+                self.evict()
+
+    def evict(self):
+        """Deletes the least recently used entries down to 90% of max_entries."""
+        entries = sorted(self._entries(), key=os.path.getmtime)
+        keep = int(self.max_entries * 0.9)
+        evicted = set()
+        for path in entries[:max(0, len(entries) - keep)]:
+            os.remove(path)
+            evicted.add(os.path.basename(path).split('-')[0])
+        self.num_entries = len(entries) - len(evicted)
+        # Forget the files whose content hash no longer has an entry
+        stale = [key for key, digest in self.stat_index.items() if digest in evicted]
+        for key in stale:
+            del self.stat_index[key]
+        self.stat_dirty = self.stat_dirty or bool(stale)
+
+    def flush(self):
+        """Writes the stat index if it changed; call once at the end of a run."""
+        if self.stat_dirty:
+            with open(self.stat_path + '.tmp', 'w') as f:
+                json.dump(self.stat_index, f)
+            os.replace(self.stat_path + '.tmp', self.stat_path)
+            self.stat_dirty = False
+
+
+# ---------- Function: Frequencies of a file, streamed and cached ----------
+def file_frequencies(filename, cache=None):
+    """
+    Returns (freq_mapping, characters, words) for a file, streaming it in blocks.
+    With a FrequencyCache the result is reused for any file with the same content.
+    """
+    entry = cache.get(filename) if cache is not None else None
+    if entry is None:
+        stats = {}
+        freq_mapping = count_frequency(iter_words_from_file(filename, stats=stats))
+        entry = (freq_mapping, stats['characters'], sum(freq_mapping.values()))
+        if cache is not None:
+            cache.put(filename, entry)
+    return entry
+
+
 # ---------- Function: Process file and return frequency mapping ----------
-def word_frequencies_for_file(filename):
+def word_frequencies_for_file(filename, cache=None):
     """
     Reads file, cleans it, counts word frequencies, and prints stats.
     Returns the word frequency dictionary.
     """
-    line_list = read_file(filename)
-    word_list = get_words_from_line_list(line_list)
-    freq_mapping = count_frequency(word_list)
+    freq_mapping, characters, words = file_frequencies(filename, cache)
 
     print("File", filename, ":")
-    print(len(line_list), "characters")
-    print(len(word_list), "words")
+    print(characters, "characters")
+    print(words, "words")
     print(len(freq_mapping), "distinct words")
 
     return freq_mapping
@@ -111,16 +267,331 @@ def vector_angle(D1, D2):
 
 
 # ---------- Main Function: Compare two documents ----------
-def documentSimilarity(filename_1, filename_2):
+def documentSimilarity(filename_1, filename_2, cache=None):
     """
     Computes and prints the similarity (angle in radians)
     between two text documents.
     """
-    sorted_word_list_1 = word_frequencies_for_file(filename_1)
-    sorted_word_list_2 = word_frequencies_for_file(filename_2)
+    sorted_word_list_1 = word_frequencies_for_file(filename_1, cache)
+    sorted_word_list_2 = word_frequencies_for_file(filename_2, cache)
     distance = vector_angle(sorted_word_list_1, sorted_word_list_2)
     print("The distance between the documents is: %0.6f radians" % distance)
 
 
+# ---------- Function: Expand corpus paths ----------
+def corpus_files(paths):
+    """
+    Expands directories, glob patterns and plain file names into a sorted list of files.
+    """
+    files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.update(os.path.join(root, name) for name in names)
+        else:
+            files.update(m for m in glob.glob(path) if os.path.isfile(m))
+    return sorted(files)
+
+
+# ---------- Class: Inverted index for corpus-wide search ----------
+class InvertedIndex:
+    """
+    Inverted index over a corpus: term -> list of (doc_id, tf) postings,
+    plus the precomputed vector norm of every document.
+    Each document is read and tokenized exactly once, when it is added.
+    """
+
+    def __init__(self):
+        self.doc_names = []   # doc_id -> filename
+        self.norms = []       # doc_id -> sqrt(sum tf^2)
+        self.postings = {}    # term -> [(doc_id, tf), ...]
+
+    def add_document(self, name, freq_mapping):
+        """Adds one document's word-frequency dictionary to the index."""
+        doc_id = len(self.doc_names)
+        self.doc_names.append(name)
+        self.norms.append(math.sqrt(dotProduct(freq_mapping, freq_mapping)))
+        for term, tf in freq_mapping.items():
+            self.postings.setdefault(term, []).append((doc_id, tf))
+        return doc_id
+
+    @classmethod
+    def build(cls, filenames, cache=None):
+        """Tokenizes every file once and indexes it."""
+        index = cls()
+        for filename in filenames:
+            index.add_document(filename, file_frequencies(filename, cache)[0])
+        return index
+
+    def query(self, freq_mapping, k=10):
+        """
+        Returns the k most similar documents as (filename, angle in radians), smallest angle first.
+        Only postings of terms that occur in the query are touched.
+        """
+        query_norm = math.sqrt(dotProduct(freq_mapping, freq_mapping))
+        if query_norm == 0:
+            return []
+        scores = {}
+        for term, q_tf in freq_mapping.items():
+            for doc_id, tf in self.postings.get(term, ()):
+                scores[doc_id] = scores.get(doc_id, 0.0) + q_tf * tf
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1] / self.norms[item[0]])
+        results = []
+        for doc_id, dot in best:
+            cosine = min(1.0, dot / (query_norm * self.norms[doc_id]))
+            results.append((self.doc_names[doc_id], math.acos(cosine)))
+        return results
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump((self.doc_names, self.norms, self.postings), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        index = cls()
+        with open(path, 'rb') as f:
+            index.doc_names, index.norms, index.postings = pickle.load(f)
+        return index
+
+
+# ---------- Function: Sparse term-document matrix ----------
+def term_document_matrix(freq_mappings, tfidf=False):
+    """
+    Builds a sparse documents x terms matrix from word-frequency dictionaries.
+    With tfidf=True each tf is weighted by log(N / df) + 1.
+    Rows are L2-normalized, so a row-by-row product is the cosine of the angle.
+    Needs numpy and scipy (imported here so the rest of the script does not).
+    """
+    import numpy as np
+    import scipy.sparse as sp
+
+    vocabulary = {}
+    rows, cols, data = [], [], []
+    for doc_id, freq_mapping in enumerate(freq_mappings):
+        for term, tf in freq_mapping.items():
+            rows.append(doc_id)
+            cols.append(vocabulary.setdefault(term, len(vocabulary)))
+            data.append(tf)
+    matrix = sp.csr_matrix((np.array(data, dtype=float), (rows, cols)),
+                           shape=(len(freq_mappings), len(vocabulary)))
+    if tfidf:
+        df = np.bincount(matrix.indices, minlength=len(vocabulary))
+        idf = np.log(matrix.shape[0] / np.maximum(df, 1)) + 1.0
+        matrix = matrix @ sp.diags(idf)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sp.csr_matrix(sp.diags(1.0 / norms) @ matrix), vocabulary
+
+
+# ---------- Function: All-pairs similarity in blocks ----------
+def similar_pairs(freq_mappings, max_angle=0.5, tfidf=False, block_size=1000):
+    """
+    Yields (i, j, angle) for every pair of documents i < j whose angle is at most max_angle.
+    Similarities are computed block_size rows at a time as sparse matrix products,
+    so memory depends on the block size and not on the number of pairs.
+    """
+    import numpy as np
+
+    matrix, _ = term_document_matrix(freq_mappings, tfidf)
+    min_cosine = math.cos(max_angle)
+    n = matrix.shape[0]
+    for start in range(0, n, block_size):
+        stop = min(n, start + block_size)
+        # Only columns >= start: pairs with earlier documents were produced by earlier blocks
+        block = (matrix[start:stop] @ matrix[start:].T).tocoo()
+        i = block.row + start
+        j = block.col + start
+        keep = (j > i) & (block.data >= min_cosine)
+        angles = np.arccos(np.clip(block.data[keep], -1.0, 1.0))
+        yield from zip(i[keep].tolist(), j[keep].tolist(), angles.tolist())
+
+
+# ---------- Class: MinHash signatures with banded LSH ----------
+class MinHashLSH:
+    """
+    Near-duplicate detection without comparing every pair:
+    - each document becomes a set of word shingles (k consecutive words),
+    - a MinHash signature of num_perm values estimates the shingle-set overlap,
+    - the signature is cut into bands; documents sharing any band bucket are candidates.
+    Candidates are then verified with vector_angle() on their word frequencies.
+    Signatures and buckets can be saved, so new documents are checked against the
+    corpus by bucket lookups instead of a scan. Needs numpy (imported on first use).
+    """
+    PRIME = (1 << 31) - 1   # hashes are 32-bit, so a * h + b fits in 64 bits
+
+    def __init__(self, num_perm=128, bands=32, shingle_size=5, seed=1):
+        import numpy as np
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, self.PRIME, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, self.PRIME, num_perm, dtype=np.uint64)
+        self.doc_names = []
+        self.signatures = []
+        self.buckets = [{} for _ in range(bands)]   # band -> {band bytes: [doc_id, ...]}
+
+    def shingles(self, word_list):
+        """Returns the set of 32-bit hashes of the document's word k-grams."""
+        k = min(self.shingle_size, len(word_list)) or 1
+        return {zlib.crc32(" ".join(word_list[i:i + k]).encode('utf-8'))
+                for i in range(max(1, len(word_list) - k + 1))}
+
+    def signature(self, word_list):
+        """MinHash signature: for every hash function, the minimum over all shingles."""
+        import numpy as np
+        hashes = np.fromiter(self.shingles(word_list), dtype=np.uint64)
+        return ((self.a[:, None] * hashes[None, :] + self.b[:, None]) % self.PRIME).min(axis=1)
+
+    def _bands(self, sig):
+        return [sig[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def add(self, name, word_list):
+        """
+        Adds a document to the LSH buckets and returns its id. Documents without words
+        are skipped (None is returned): they would all share one shingle and collide.
+        """
+        if not word_list:
+            return None
+        doc_id = len(self.doc_names)
+        sig = self.signature(word_list)
+        self.doc_names.append(name)
+        self.signatures.append(sig)
+        for band, key in enumerate(self._bands(sig)):
+            self.buckets[band].setdefault(key, []).append(doc_id)
+        return doc_id
+
+    def candidates(self, word_list):
+        """Ids of stored documents that share at least one band bucket with this document."""
+        found = set()
+        if not word_list:
+            return found
+        for band, key in enumerate(self._bands(self.signature(word_list))):
+            found.update(self.buckets[band].get(key, ()))
+        return found
+
+    def candidate_pairs(self):
+        """All (i, j), i < j, of stored documents that share a band bucket."""
+        pairs = set()
+        for table in self.buckets:
+            for doc_ids in table.values():
+                for x in range(len(doc_ids)):
+                    for y in range(x + 1, len(doc_ids)):
+                        pairs.add((doc_ids[x], doc_ids[y]))
+        return sorted(pairs)
+
+    def save(self, path):
+        # Plain state only, so the file loads no matter which module saved it
+        state = (self.num_perm, self.bands, self.shingle_size, self.a, self.b,
+                 self.doc_names, self.signatures, self.buckets)
+        with open(path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            num_perm, bands, shingle_size, a, b, doc_names, signatures, buckets = pickle.load(f)
+        lsh = cls(num_perm, bands, shingle_size)
+        lsh.a, lsh.b = a, b
+        lsh.doc_names, lsh.signatures, lsh.buckets = doc_names, signatures, buckets
+        return lsh
+
+
+# ---------- Function: Word list of a file, streamed ----------
+def file_words(filename, cache=None):
+    """
+    Returns the file's words in order (MinHash shingles need the sequence), read with
+    iter_words_from_file. With a FrequencyCache the file's frequencies are stored too,
+    so later index / all-pairs runs reuse them.
+    """
+    stats = {}
+    word_list = list(iter_words_from_file(filename, stats=stats))
+    if cache is not None and cache.get(filename) is None:
+        cache.put(filename, (count_frequency(word_list), stats['characters'], len(word_list)))
+    return word_list
+
+
+# ---------- Function: Near-duplicate pairs with LSH ----------
+def near_duplicates(filenames, lsh, max_angle=0.5, cache=None):
+    """
+    Adds every file to lsh and returns (file_1, file_2, angle) for candidate pairs
+    whose verified angle is at most max_angle. Only candidates' frequencies are compared.
+    """
+    freq_mappings = {}   # doc id -> frequencies; empty documents get no id
+    for filename in filenames:
+        word_list = file_words(filename, cache)
+        doc_id = lsh.add(filename, word_list)
+        if doc_id is not None:
+            freq_mappings[doc_id] = count_frequency(word_list)
+    results = []
+    for i, j in lsh.candidate_pairs():
+        angle = vector_angle(freq_mappings[i], freq_mappings[j])
+        if angle <= max_angle:
+            results.append((lsh.doc_names[i], lsh.doc_names[j], angle))
+    return results
+
+
 # ---------- Run program ----------
-documentSimilarity('sample1.txt', 'sample2.txt')
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Document similarity by the angle between word-frequency vectors.")
+    parser.add_argument("files", nargs="*", default=['sample1.txt', 'sample2.txt'],
+                        help="Two documents to compare (default: sample1.txt sample2.txt).")
+    parser.add_argument("--build-index", nargs="+", metavar="CORPUS",
+                        help="Index these files / directories / glob patterns into --index.")
+    parser.add_argument("--index", default="similarity.index", help="Inverted index file.")
+    parser.add_argument("--query", help="Find the documents in --index most similar to this file.")
+    parser.add_argument("--top", type=int, default=10, help="Number of results for --query.")
+    parser.add_argument("--all-pairs", nargs="+", metavar="CORPUS",
+                        help="List every pair of documents in these files / directories within --max-angle.")
+    parser.add_argument("--max-angle", type=float, default=0.5, help="Angle cutoff in radians for --all-pairs.")
+    parser.add_argument("--tfidf", action="store_true", help="Weight terms by TF-IDF for --all-pairs.")
+    parser.add_argument("--lsh-build", nargs="+", metavar="CORPUS",
+                        help="MinHash these documents into --lsh and list near-duplicates within --max-angle.")
+    parser.add_argument("--lsh", default="similarity.lsh", help="Stored MinHash/LSH signatures file.")
+    parser.add_argument("--cache", metavar="DIR", help="Reuse word frequencies cached in this directory.")
+    parser.add_argument("--lsh-query", help="Check a new document against the documents stored in --lsh.")
+    args = parser.parse_args()
+    if args.files and len(args.files) != 2:
+        parser.error("give exactly two documents to compare (got %d)" % len(args.files))
+    cache = FrequencyCache(args.cache) if args.cache else None
+
+    if args.build_index:
+        files = corpus_files(args.build_index)
+        InvertedIndex.build(files, cache).save(args.index)
+        print("Indexed", len(files), "documents into", args.index)
+    if args.query:
+        index = InvertedIndex.load(args.index)
+        query_freq = file_frequencies(args.query, cache)[0]
+        print("Most similar documents to", args.query, ":")
+        for name, angle in index.query(query_freq, args.top):
+            print("%0.6f radians  %s" % (angle, name))
+    if args.all_pairs:
+        files = corpus_files(args.all_pairs)
+        freq_mappings = [file_frequencies(f, cache)[0] for f in files]
+        for i, j, angle in similar_pairs(freq_mappings, args.max_angle, args.tfidf):
+            print("%0.6f radians  %s  %s" % (angle, files[i], files[j]))
+    if args.lsh_build:
+        lsh = MinHashLSH()
+        for name_1, name_2, angle in near_duplicates(corpus_files(args.lsh_build), lsh, args.max_angle, cache):
+            print("%0.6f radians  %s  %s" % (angle, name_1, name_2))
+        lsh.save(args.lsh)
+    if args.lsh_query:
+        lsh = MinHashLSH.load(args.lsh)
+        word_list = file_words(args.lsh_query, cache)
+        query_freq = count_frequency(word_list)
+        print("Near-duplicates of", args.lsh_query, ":")
+        for doc_id in sorted(lsh.candidates(word_list)):
+            name = lsh.doc_names[doc_id]
+            doc_freq = file_frequencies(name, cache)[0]
+            if not doc_freq:
+                continue   # emptied since it was stored
+            angle = vector_angle(query_freq, doc_freq)
+            if angle <= args.max_angle:
+                print("%0.6f radians  %s" % (angle, name))
+    if not any([args.build_index, args.query, args.all_pairs, args.lsh_build, args.lsh_query]):
+        documentSimilarity(*args.files, cache=cache)
+    if cache is not None:
+        cache.flush()
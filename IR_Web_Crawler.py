@@ -1,6 +1,21 @@
+import argparse
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin, urlparse
+
 import requests
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+
+from IR_Crawl_Frontier import DiskFrontier, FingerprintSet, MemoryFrontier, ScalableBloomFilter, normalize_url
+from IR_HTTP_Cache import CachedSession, make_session
+from IR_Link_Extractor import DEFAULT_EXTRACTOR, EXTRACTORS
+
+SEEN_SETS = {'set': set, 'fingerprints': FingerprintSet, 'bloom': ScalableBloomFilter}
 
 # ------------------------------------------
 # A Simple Web Crawler
@@ -8,16 +23,18 @@ from urllib.parse import urljoin, urlparse
 class WebCrawler:
     """A simple recursive web crawler class."""
 
-    def __init__(self, seed_url, max_depth=2):
+    def __init__(self, seed_url, max_depth=2, session=None):
         """
         Initialize the crawler.
         seed_url  : Starting URL
         max_depth : Maximum link depth to crawl
+        session   : Optional shared (pooled / cached) session
         """
         self.seed_url = seed_url
         self.max_depth = max_depth
         self.visited_urls = set()                  # To avoid visiting same link twice
         self.base_domain = urlparse(seed_url).netloc  # Restrict crawling to same website
+        self.session = session or make_session()   # Keep-alive connections between pages
 
     def crawl(self):
         """Start crawling from the seed URL."""
@@ -38,7 +55,7 @@ class WebCrawler:
 
         try:
             # Send GET request to fetch page content
-            response = requests.get(current_url, timeout=5)
+            response = self.session.get(current_url, timeout=5)
             response.raise_for_status()  # Raise error for invalid responses
 
             # Parse HTML content using BeautifulSoup
@@ -65,21 +82,253 @@ class WebCrawler:
         except Exception as e:
             print(f"An error occurred while processing {current_url}: {e}")
 
+# ------------------------------------------
+# Concurrent (asyncio) Web Crawler
+# ------------------------------------------
+class AsyncWebCrawler:
+    """
+    Breadth-first crawler that keeps many fetches in flight at once.
+    Same max_depth and same-domain rules as WebCrawler, but pages are taken from a
+    FIFO frontier instead of recursion, so deep sites cannot hit the recursion limit.
+    """
+
+    def __init__(self, seed_url, max_depth=2, concurrency=16, per_host_limit=4,
+                 per_host_delay=0.0, timeout=5, verbose=True, session=None,
+                 state_dir=None, seen_set='set', seen_capacity=1_000_000, checkpoint_every=100,
+                 link_extractor=DEFAULT_EXTRACTOR, save_pages=None):
+        """
+        seed_url       : Starting URL
+        max_depth      : Maximum link depth to crawl
+        concurrency    : Total number of fetches in flight
+        per_host_limit : Fetches in flight against any single host
+        per_host_delay : Minimum seconds between the starts of two requests to one host
+        session        : Optional shared (pooled / cached) session
+        state_dir      : Keep the frontier and seen set on disk here; a killed crawl resumes from it
+        seen_set       : 'set' (exact URLs), 'fingerprints' (64-bit hashes) or 'bloom' (Bloom filter)
+        seen_capacity  : Expected number of URLs; sizes the fingerprint table / first Bloom stage
+        link_extractor : Name of an IR_Link_Extractor extractor ('lxml', 'htmlparser', 'bs4')
+        save_pages     : Directory to save every fetched page into (e.g. for extractor benchmarks)
+        """
+        seed_url = normalize_url(seed_url)
+        self.seed_url = seed_url
+        self.max_depth = max_depth
+        self.concurrency = concurrency
+        self.per_host_limit = per_host_limit
+        self.per_host_delay = per_host_delay
+        self.timeout = timeout
+        self.verbose = verbose
+        self.state_dir = state_dir
+        self.checkpoint_every = checkpoint_every
+        if state_dir:
+            seen_factory = SEEN_SETS['fingerprints' if seen_set == 'set' else seen_set]
+            self.frontier = DiskFrontier(state_dir, seen_factory, seen_capacity)
+            self.visited_urls = self.frontier.load_seen()  # URLs fetched or queued
+        else:
+            self.frontier = MemoryFrontier()
+            self.visited_urls = set() if seen_set == 'set' else SEEN_SETS[seen_set](seen_capacity)
+        self.base_domain = urlparse(seed_url).netloc  # Restrict crawling to same website
+        self._host_slots = {}                         # host -> asyncio.Semaphore
+        self._host_next_start = {}                    # host -> earliest time of next request
+        self._host_locks = {}                         # host -> asyncio.Lock for the delay
+        self.session = session or make_session(pool_size=concurrency)
+        self.link_extractor = EXTRACTORS[link_extractor]
+        self.save_pages = save_pages
+        if save_pages:
+            os.makedirs(save_pages, exist_ok=True)
+
+    def fetch(self, url):
+        """Blocking fetch run in a worker thread; returns (body bytes, encoding)."""
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        if self.save_pages:
+            name = hashlib.sha1(url.encode('utf-8')).hexdigest() + '.html'
+            with open(os.path.join(self.save_pages, name), 'wb') as f:
+                f.write(response.content)
+        return response.content, response.encoding
+
+    def extract_links(self, page_url, body, encoding=None):
+        """Absolute same-domain http(s) links found on a page."""
+        links = []
+        for absolute_url in self.link_extractor(page_url, body, encoding):
+            absolute_url = normalize_url(absolute_url)   # same spelling as base_domain
+            parsed_url = urlparse(absolute_url)
+            if parsed_url.scheme in ['http', 'https'] and parsed_url.netloc == self.base_domain:
+                links.append(absolute_url)
+        return links
+
+    async def _polite_fetch(self, loop, executor, url):
+        """Fetches url while honouring the per-host concurrency and delay limits."""
+        host = urlparse(url).netloc
+        slots = self._host_slots.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
+        async with slots:
+            if self.per_host_delay:
+                async with lock:
+                    wait = self._host_next_start.get(host, 0) - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    self._host_next_start[host] = time.monotonic() + self.per_host_delay
+            return await loop.run_in_executor(executor, self.fetch, url)
+
+    async def _worker(self, loop, executor):
+        frontier = self.frontier
+        while True:
+            entry = frontier.pop()
+            if entry is None:
+                if self._in_flight == 0:
+                    self._changed.set()   # frontier drained: wake the others so they exit too
+                    return
+                self._changed.clear()
+                await self._changed.wait()
+                continue
+            token, url, depth = entry
+            self._in_flight += 1
+            try:
+                if self.verbose:
+                    print(f"Crawling (Depth {depth}): {url}")
+                body, encoding = await self._polite_fetch(loop, executor, url)
+                if depth < self.max_depth:
+                    for link in await loop.run_in_executor(executor, self.extract_links, url, body, encoding):
+                        link = normalize_url(link)
+                        if link not in self.visited_urls:
+                            self.visited_urls.add(link)
+                            frontier.push(link, depth + 1)
+            except requests.exceptions.RequestException as e:
+                print(f"Could not fetch URL {url}: {e}")
+            except Exception as e:
+                print(f"An error occurred while processing {url}: {e}")
+            finally:
+                self._in_flight -= 1
+                frontier.done(token)
+                self._pages_done += 1
+                if self._pages_done % self.checkpoint_every == 0:
+                    frontier.checkpoint(self.visited_urls)
+                self._changed.set()
+
+    async def crawl_async(self):
+        """Crawl from the seed URL (or the saved state) until the frontier is empty."""
+        loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+        self._in_flight = 0
+        self._pages_done = 0
+        if self.seed_url not in self.visited_urls:
+            self.visited_urls.add(self.seed_url)
+            self.frontier.push(self.seed_url, 0)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            await asyncio.gather(*(self._worker(loop, executor) for _ in range(self.concurrency)))
+        self.frontier.checkpoint(self.visited_urls, full=True)
+
+    def crawl(self):
+        """Start crawling from the seed URL."""
+        asyncio.run(self.crawl_async())
+
+
+# ------------------------------------------
+# Local Test Site
+# ------------------------------------------
+def start_generated_site(num_pages=2000, links_per_page=5, latency=0.0, port=0):
+    """
+    Serves a generated site of num_pages pages on localhost in a background thread,
+    for exercising the crawlers without touching the internet.
+    Page i links to pages i*links_per_page+1 ... (a tree), plus one link back to the root.
+    latency adds a sleep to every response to mimic a remote server.
+    Returns (server, root_url); call server.shutdown() when done.
+    """
+    class SiteHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+            try:
+                page = int(self.path.strip('/').split('/')[-1].split('.')[0] or 0)
+            except ValueError:
+                page = -1
+            if not 0 <= page < num_pages:
+                self.send_error(404)
+                return
+            children = range(page * links_per_page + 1, min(num_pages, (page + 1) * links_per_page + 1))
+            links = ''.join(f'<li><a href="/page/{child}.html">Page {child}</a></li>' for child in children)
+            body = (f'<html><head><title>Page {page}</title></head><body><h1>Page {page}</h1>'
+                    f'<ul>{links}</ul><a href="/page/0.html">Home</a>'
+                    f'<a href="https://example.com/">External</a></body></html>').encode('utf-8')
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # keep the crawler output readable
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), SiteHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/page/0.html"
+
+
 # ------------------------------------------
 # Main Function
 # ------------------------------------------
 def main():
     """Main function to start the web crawler."""
+    parser = argparse.ArgumentParser(description="Crawl a website up to a maximum link depth.")
     # Safe website to test crawler
-    seed_url = "http://info.cern.ch/hypertext/WWW/TheProject.html"
+    parser.add_argument("seed_url", nargs="?", default="http://info.cern.ch/hypertext/WWW/TheProject.html")
     # seed_url = "https://medium.com/@mandalsaurav3/do-hard-things-if-you-want-an-easy-life-81be3a096207"
-    
-    # Create crawler object with max depth of 2
-    crawler = WebCrawler(seed_url, max_depth=2)
-    
+    parser.add_argument("--depth", type=int, default=2, help="Maximum link depth.")
+    parser.add_argument("--sequential", action="store_true", help="Use the simple one-page-at-a-time crawler.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Fetches in flight.")
+    parser.add_argument("--per-host", type=int, default=4, help="Fetches in flight per host.")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds between requests to one host.")
+    parser.add_argument("--local-site", type=int, metavar="PAGES",
+                        help="Crawl a generated local site of this many pages instead of seed_url.")
+    parser.add_argument("--state", metavar="DIR", help="Persist the frontier here; rerun with the same DIR to resume.")
+    parser.add_argument("--seen", choices=sorted(SEEN_SETS), default="set",
+                        help="Seen-URL set: exact URLs, 64-bit fingerprints or a Bloom filter.")
+    parser.add_argument("--seen-capacity", type=int, default=1_000_000,
+                        help="Expected number of URLs, to pre-size --seen fingerprints/bloom.")
+    parser.add_argument("--extractor", choices=sorted(EXTRACTORS), default=DEFAULT_EXTRACTOR,
+                        help="Link extractor for the concurrent crawler.")
+    parser.add_argument("--save-pages", metavar="DIR", help="Save fetched pages here (input for IR_Link_Extractor.py).")
+    parser.add_argument("--cache", metavar="DIR", help="Keep an HTTP cache here and revalidate with conditional GETs.")
+    parser.add_argument("--site-latency", type=float, default=0.0, help="Response delay of the local site.")
+    parser.add_argument("--site-port", type=int, default=0, help="Port of the local site (default: any free port).")
+    args = parser.parse_args()
+
+    seed_url, server = args.seed_url, None
+    if args.local_site:
+        server, seed_url = start_generated_site(args.local_site, latency=args.site_latency,
+                                                port=args.site_port)
+
+    # Shared pooled session, optionally with the on-disk cache
+    session = make_session(pool_size=args.concurrency)
+    if args.cache:
+        session = CachedSession(args.cache, session=session)
+
+    # Create crawler object
+    if args.sequential:
+        crawler = WebCrawler(seed_url, max_depth=args.depth, session=session)
+    else:
+        crawler = AsyncWebCrawler(seed_url, max_depth=args.depth, concurrency=args.concurrency,
+                                  per_host_limit=args.per_host, per_host_delay=args.delay, session=session,
+                                  state_dir=args.state, seen_set=args.seen, seen_capacity=args.seen_capacity,
+                                  link_extractor=args.extractor, save_pages=args.save_pages)
+
     # Start crawling
+    start = time.perf_counter()
     crawler.crawl()
-    print(f"\nCrawling finished. Visited {len(crawler.visited_urls)} unique pages.")
+    elapsed = time.perf_counter() - start
+    print(f"\nCrawling finished. Visited {len(crawler.visited_urls)} unique pages in {elapsed:.2f} s.")
+    if args.cache:
+        print(session.report())
+    if server:
+        server.shutdown()
 
 # Run main if script is executed directly
 if __name__ == "__main__":
@@ -1,17 +1,19 @@
+import argparse
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urljoin, urlparse
+
 import requests
 from bs4 import BeautifulSoup
 from xlwt import Workbook
-import time
 
-# Web Crawler
-workbook = Workbook(encoding='utf-8')
-sheet = workbook.add_sheet('HackerNews')
-sheet.write(0, 0, 'Number')
-sheet.write(0, 1, 'Title')
-sheet.write(0, 2, 'Link')
-sheet.write(0, 3, 'Points')
-sheet.write(0, 4, 'Submitter')
+from IR_HTTP_Cache import CachedSession, TokenBucket
 
+# Web Crawler
 url = "https://news.ycombinator.com/"
 headers = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -19,44 +21,170 @@ headers = {
                   "Chrome/120.0.0.0 Safari/537.36"
 }
 
-print("Fetching Hacker News homepage...")
-response = requests.get(url, headers=headers)
 
-if response.status_code != 200:
-    print(f"Failed to fetch page! Status code: {response.status_code}")
-    exit()
+def fetch_page(session, limiter, page_url):
+    """Fetches one listing page, or returns None; the token bucket throttles the request itself."""
+    limiter.acquire()
+    try:
+        response = session.get(page_url, timeout=10)
+    except requests.exceptions.RequestException as e:
+        print(f"Failed to fetch {page_url}! {e}")
+        return None
+    if response.status_code != 200:
+        print(f"Failed to fetch {page_url}! Status code: {response.status_code}")
+        return None
+    return response.content
 
-soup = BeautifulSoup(response.content, 'lxml')
 
-# Find story rows
-story_rows = soup.find_all('tr', class_='athing')
-print(f"Found {len(story_rows)} stories.")
+def parse_stories(html, base_url):
+    """Returns ([(title, link, points, submitter), ...], url of the "More" page or None)."""
+    soup = BeautifulSoup(html, 'lxml')
+    stories = []
+    # Find story rows
+    for story in soup.find_all('tr', class_='athing'):
+        try:
+            title_tag = story.find('a', class_='storylink')
+            if title_tag is None:
+                titleline = story.find('span', class_='titleline')
+                title_tag = titleline.find('a') if titleline else None
+            if title_tag:
+                title = title_tag.get_text(strip=True)
+                link = urljoin(base_url, title_tag['href'])
+            else:
+                title = "No title"
+                link = "N/A"
 
-line = 1
-for num, story in enumerate(story_rows[:50], start=1):  # Top 50
-    try:
-        title_tag = story.find('a', class_='storylink')
-        if title_tag:
-            title = title_tag.get_text(strip=True)
-            link = title_tag['href']
-            if link.startswith('/'):
-                link = "https://news.ycombinator.com" + link
-        else:
-            title = "No title"
-            link = "N/A"
-
-        # Get subtext row (points, submitter)
-        subtext_row = story.find_next_sibling('tr')
-        subtext = subtext_row.find('td', class_='subtext') if subtext_row else None
-        if subtext:
-            points_tag = subtext.find('span', class_='score')
-            points = points_tag.get_text(strip=True) if points_tag else '0 points'
-            user_tag = subtext.find('a', class_='hnuser')
-            submitter = user_tag.get_text(strip=True) if user_tag else 'N/A'
+            # Get subtext row (points, submitter)
+            subtext_row = story.find_next_sibling('tr')
+            subtext = subtext_row.find('td', class_='subtext') if subtext_row else None
+            if subtext:
+                points_tag = subtext.find('span', class_='score')
+                points = points_tag.get_text(strip=True) if points_tag else '0 points'
+                user_tag = subtext.find('a', class_='hnuser')
+                submitter = user_tag.get_text(strip=True) if user_tag else 'N/A'
+            else:
+                points = '0 points'
+                submitter = 'N/A'
+            stories.append((title, link, points, submitter))
+        except Exception as e:
+            print(f"Skipped a story due to error: {e}")
+
+    more = soup.find('a', class_='morelink')
+    return stories, (urljoin(base_url, more['href']) if more else None)
+
+
+def scrape(start_url, num_pages=2, rate=2.0, burst=2, workers=4, session=None, save_fixtures=None):
+    """
+    Scrapes num_pages listing pages and returns (stories in page order, number of
+    pages actually fetched).
+    Page 1's "More" link gives the ?p=N pattern, so the remaining pages are fetched
+    concurrently; links that do not follow that pattern are followed one by one.
+    All requests share one token bucket of `rate` requests/second.
+    """
+    session = session or CachedSession('http_cache', headers=headers)
+    limiter = TokenBucket(rate, burst)
+    pages = {}
+
+    def get(page_number, page_url):
+        html = fetch_page(session, limiter, page_url)
+        if html is not None and save_fixtures:
+            os.makedirs(save_fixtures, exist_ok=True)
+            with open(os.path.join(save_fixtures, f"news_p{page_number}.html"), 'wb') as f:
+                f.write(html)
+        return html
+
+    print("Fetching Hacker News homepage...")
+    html = get(1, start_url)
+    if html is None:
+        return [], 0
+    pages[1], more_url = parse_stories(html, start_url)
+
+    if num_pages > 1 and more_url:
+        query = parse_qs(urlparse(more_url).query)
+        if 'p' in query and query['p'][0].isdigit():
+            # Predictable pagination: fetch every remaining page at once
+            page_urls = {n: re.sub(r'([?&]p=)\d+', rf'\g<1>{n}', more_url) for n in range(2, num_pages + 1)}
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {n: executor.submit(get, n, page_url) for n, page_url in page_urls.items()}
+                for n, future in futures.items():
+                    html = future.result()
+                    if html is not None:
+                        pages[n] = parse_stories(html, page_urls[n])[0]
         else:
-            points = '0 points'
-            submitter = 'N/A'
+            page_number = 1
+            while more_url and page_number < num_pages:
+                page_number += 1
+                html = get(page_number, more_url)
+                if html is None:
+                    break
+                pages[page_number], more_url = parse_stories(html, more_url)
 
+    return [story for n in sorted(pages) for story in pages[n]], len(pages)
+
+
+def serve_fixtures(directory, port=0):
+    """
+    Stand-in for the live site: serves saved news_p<N>.html files from directory on
+    localhost, mapping "/" to page 1 and "/news?p=N" (or "/?p=N") to page N.
+    Returns (server, start_url); call server.shutdown() when done.
+    """
+    class FixtureHandler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=directory, **kwargs)
+
+        def translate_path(self, path):
+            page = parse_qs(urlparse(path).query).get('p', ['1'])[0]
+            return os.path.join(directory, f"news_p{int(page) if page.isdigit() else 0}.html")
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), FixtureHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape Hacker News stories into an Excel sheet.")
+    parser.add_argument("--pages", type=int, default=2, help="Number of listing pages to follow.")
+    parser.add_argument("--limit", type=int, default=50, help="Number of stories to keep.")
+    parser.add_argument("--rate", type=float, default=2.0, help="Requests per second.")
+    parser.add_argument("--burst", type=int, default=2, help="Requests allowed back to back.")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent page fetches.")
+    parser.add_argument("--fixtures", metavar="DIR", help="Scrape saved news_p<N>.html pages from a local stand-in server.")
+    parser.add_argument("--fixtures-port", type=int, default=8808,
+                        help="Port of the stand-in server; fixed so cached pages keep the same URLs.")
+    parser.add_argument("--save-fixtures", metavar="DIR", help="Save every fetched page as news_p<N>.html.")
+    parser.add_argument("--output", default="hackernews_top50.xls")
+    args = parser.parse_args()
+    if args.rate <= 0:
+        parser.error("--rate must be greater than 0")
+    if args.burst < 1:
+        parser.error("--burst must be at least 1")
+
+    # Pooled keep-alive session; re-runs revalidate cached pages with conditional GETs
+    start_url, server, cache_dir = url, None, 'http_cache'
+    if args.fixtures:
+        server, start_url = serve_fixtures(args.fixtures, args.fixtures_port)
+        cache_dir = os.path.join(args.fixtures, '.http_cache')
+    session = CachedSession(cache_dir, headers=headers)
+
+    started = time.perf_counter()
+    stories, pages_fetched = scrape(start_url, args.pages, args.rate, args.burst, args.workers, session,
+                                    args.save_fixtures)
+    print(f"Found {len(stories)} stories on {pages_fetched} pages in {time.perf_counter() - started:.2f} s.")
+
+    workbook = Workbook(encoding='utf-8')
+    sheet = workbook.add_sheet('HackerNews')
+    sheet.write(0, 0, 'Number')
+    sheet.write(0, 1, 'Title')
+    sheet.write(0, 2, 'Link')
+    sheet.write(0, 3, 'Points')
+    sheet.write(0, 4, 'Submitter')
+
+    line = 1
+    for num, (title, link, points, submitter) in enumerate(stories[:args.limit], start=1):
         # Print progress
         print(f"{num}. {title}")
         print(f"Link: {link}")
@@ -71,12 +199,8 @@ for num, story in enumerate(story_rows[:50], start=1):  # Top 50
         sheet.write(line, 4, submitter)
         line += 1
 
-        time.sleep(0.2)  
-
-    except Exception as e:
-        print(f"Skipped a story due to error: {e}")
-        continue
-
-
-workbook.save('hackernews_top50.xls')
-print("Excel file saved as hackernews_top50.xls")
+    workbook.save(args.output)
+    print(f"Excel file saved as {args.output}")
+    print(session.report())
+    if server:
+        server.shutdown()
@@ -4,46 +4,98 @@ This program reads an XML file and displays its contents.
 """
 
 # Import the XML processing library
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import pickle
 import xml.etree.ElementTree as ET
+from array import array
+
+# Child tags read from every <book>
+BOOK_FIELDS = ['author', 'title', 'genre', 'price', 'publish_date']
+
+
+# -------------------------------
+# Function: Convert one <book> element to a record
+# -------------------------------
+def book_record(book):
+    """
+    Returns a dict with the book's 'id' and BOOK_FIELDS.
+    A missing child tag (or an empty one) gives None instead of an exception.
+
+    Args:
+        book (Element): A <book> element.
+    """
+    record = {'id': book.get('id')}
+    for field in BOOK_FIELDS:
+        child = book.find(field)
+        record[field] = child.text.strip() if child is not None and child.text else None
+    return record
+
+
+# -------------------------------
+# Function: Stream book records
+# -------------------------------
+def iter_books(file_path):
+    """
+    Yields one book record at a time using iterparse, clearing every processed
+    <book> so memory stays constant no matter how large the catalog is.
+    Only <book> elements directly under the root are read, like root.findall('book').
+
+    Args:
+        file_path (str): The path to the XML file.
+    """
+    depth = 0
+    root = None
+    for event, element in ET.iterparse(file_path, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+            depth += 1
+            continue
+        depth -= 1
+        if depth == 1 and element.tag == 'book':
+            yield book_record(element)
+            element.clear()
+            root.clear()   # drop the finished children the root still references
+
 
 # -------------------------------
 # Function: Parse and Display XML
 # -------------------------------
-def parse_and_display_xml(file_path):
+def parse_and_display_xml(file_path, stream=False):
     """
     Parses an XML file and prints its content in a structured way.
 
     Args:
         file_path (str): The path to the XML file.
+        stream (bool): Read the file incrementally with iter_books() instead of
+            building the whole tree first.
     """
     try:
-        # Load and parse the XML file
-        tree = ET.parse(file_path)
+        if stream:
+            books = iter_books(file_path)
+        else:
+            # Load and parse the XML file
+            tree = ET.parse(file_path)
 
-        # Get the root element (top-level tag)
-        root = tree.getroot()
+            # Get the root element (top-level tag)
+            root = tree.getroot()
+            books = (book_record(book) for book in root.findall('book'))
 
         print("--- Processing Library Data from XML ---")
 
         # Loop through each <book> element in the XML
-        for i, book in enumerate(root.findall('book')):
-            # Get 'id' attribute from <book> tag
-            book_id = book.get('id')
-
-            # Extract text inside each child tag
-            author = book.find('author').text
-            title = book.find('title').text
-            genre = book.find('genre').text
-            price = book.find('price').text
-            publish_date = book.find('publish_date').text
-
+        for i, book in enumerate(books):
             # Print formatted book details
-            print(f"\n--- Book {i+1} (ID: {book_id}) ---")
-            print(f"  Title: {title}")
-            print(f"  Author: {author}")
-            print(f"  Genre: {genre}")
-            print(f"  Price: ${price}")
-            print(f"  Publish Date: {publish_date}")
+            print(f"\n--- Book {i+1} (ID: {book['id']}) ---")
+            print(f"  Title: {book['title']}")
+            print(f"  Author: {book['author']}")
+            print(f"  Genre: {book['genre']}")
+            print(f"  Price: ${book['price']}")
+            print(f"  Publish Date: {book['publish_date']}")
 
         print("\n--- XML Processing Complete ---")
 
@@ -56,6 +108,168 @@ def parse_and_display_xml(file_path):
         print(f"An unexpected error occurred: {e}")
 
 
+# -------------------------------
+# Class: Indexed catalog for queries
+# -------------------------------
+class BookIndex:
+    """
+    Secondary indexes over an XML catalog, built once and kept next to it in <file>.idx/:
+    - records.jsonl : one JSON record per book, located through a byte-offset array
+    - index.pickle  : hash indexes for author and genre (lower-cased value -> record ids),
+                      sorted (value, id) arrays for price and publish_date, and the
+                      source file's mtime, size and SHA-256
+    The index is rebuilt only when the source's mtime changes and its content hash
+    differs from the one recorded at build time.
+    """
+
+    def __init__(self, xml_path, index_dir=None):
+        self.xml_path = xml_path
+        self.index_dir = index_dir or xml_path + '.idx'
+        self.records_path = os.path.join(self.index_dir, 'records.jsonl')
+        self.index_path = os.path.join(self.index_dir, 'index.pickle')
+        if not self._load_if_fresh():
+            self.build()
+
+    @staticmethod
+    def _file_hash(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _load_if_fresh(self):
+        """Loads the saved index if it still matches the source file."""
+        try:
+            with open(self.index_path, 'rb') as f:
+                state = pickle.load(f)
+        except (IOError, EOFError, pickle.UnpicklingError, ValueError):
+            return False   # missing or damaged: rebuild
+        st = os.stat(self.xml_path)
+        source = state['source']
+        if (source['mtime'], source['size']) != (st.st_mtime, st.st_size):
+            if source['size'] != st.st_size or source['sha256'] != self._file_hash(self.xml_path):
+                return False
+            # Touched but unchanged: remember the new mtime, keep the index
+            source['mtime'] = st.st_mtime
+            self._save_state(state)
+        self.__dict__.update(state['indexes'])
+        return True
+
+    def build(self):
+        """Streams the catalog once and writes records and indexes."""
+        os.makedirs(self.index_dir, exist_ok=True)
+        st = os.stat(self.xml_path)
+        # The old index must not outlive the records it points into
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+        offsets = array('Q')
+        by_author, by_genre = {}, {}
+        prices, dates = [], []
+        with open(self.records_path + '.tmp', 'wb') as out:
+            for record_id, book in enumerate(iter_books(self.xml_path)):
+                offsets.append(out.tell())
+                out.write(json.dumps(book).encode('utf-8') + b'\n')
+                if book['author']:
+                    by_author.setdefault(book['author'].lower(), array('Q')).append(record_id)
+                if book['genre']:
+                    by_genre.setdefault(book['genre'].lower(), array('Q')).append(record_id)
+                try:
+                    prices.append((float(book['price']), record_id))
+                except (TypeError, ValueError):
+                    pass
+                if book['publish_date']:
+                    dates.append((book['publish_date'], record_id))
+        os.replace(self.records_path + '.tmp', self.records_path)
+        prices.sort()
+        dates.sort()
+        indexes = {
+            'offsets': offsets,
+            'by_author': by_author,
+            'by_genre': by_genre,
+            'price_values': array('d', (value for value, _ in prices)),
+            'price_ids': array('Q', (record_id for _, record_id in prices)),
+            'date_values': [value for value, _ in dates],
+            'date_ids': array('Q', (record_id for _, record_id in dates)),
+        }
+        state = {'source': {'mtime': st.st_mtime, 'size': st.st_size, 'sha256': self._file_hash(self.xml_path)},
+                 'indexes': indexes}
+        self._save_state(state)
+        self.__dict__.update(indexes)
+
+    def _save_state(self, state):
+        """Writes index.pickle through a temp file, so a kill never leaves it truncated."""
+        with open(self.index_path + '.tmp', 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(self.index_path + '.tmp', self.index_path)
+
+    @staticmethod
+    def _range(values, ids, low, high):
+        """Ids whose value lies in [low, high] (either bound may be None)."""
+        start = 0 if low is None else bisect.bisect_left(values, low)
+        stop = len(values) if high is None else bisect.bisect_right(values, high)
+        return set(ids[start:stop])
+
+    def query(self, author=None, genre=None, min_price=None, max_price=None,
+              published_after=None, published_before=None):
+        """
+        Returns the records matching every given condition, in catalog order.
+        author / genre match exactly (case-insensitive); prices and dates
+        (YYYY-MM-DD) are inclusive ranges.
+        """
+        candidates = []
+        if author is not None:
+            candidates.append(set(self.by_author.get(author.lower(), ())))
+        if genre is not None:
+            candidates.append(set(self.by_genre.get(genre.lower(), ())))
+        if min_price is not None or max_price is not None:
+            candidates.append(self._range(self.price_values, self.price_ids, min_price, max_price))
+        if published_after is not None or published_before is not None:
+            candidates.append(self._range(self.date_values, self.date_ids, published_after, published_before))
+        if candidates:
+            candidates.sort(key=len)
+            ids = candidates[0].intersection(*candidates[1:])
+        else:
+            ids = range(len(self.offsets))
+        return self.records(sorted(ids))
+
+    def records(self, record_ids):
+        """Reads the given records from records.jsonl by their offsets."""
+        found = []
+        with open(self.records_path, 'rb') as f:
+            for record_id in record_ids:
+                f.seek(self.offsets[record_id])
+                found.append(json.loads(f.readline()))
+        return found
+
+
+# -------------------------------
+# Function: Query and Display XML
+# -------------------------------
+def query_and_display_xml(file_path, **filters):
+    """
+    Answers a query from the catalog's BookIndex and prints the matching books.
+
+    Args:
+        file_path (str): The path to the XML file.
+        **filters: Keyword arguments of BookIndex.query().
+    """
+    try:
+        books = BookIndex(file_path).query(**filters)
+        print(f"--- {len(books)} matching books ---")
+        for book in books:
+            print(f"{book['id']}: {book['title']} by {book['author']} ({book['genre']}, "
+                  f"${book['price']}, {book['publish_date']})")
+
+    # Handle errors (if file not found or invalid XML)
+    except FileNotFoundError:
+        print(f"Error: The file '{file_path}' was not found.")
+    except ET.ParseError:
+        print(f"Error: Could not parse '{file_path}'. Check if it is a valid XML file.")
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+
+
 # -------------------------------
 # Main Function
 # -------------------------------
@@ -63,11 +277,27 @@ def main():
     """
     Main function to start the XML parsing.
     """
+    parser = argparse.ArgumentParser(description="Display the books in an XML catalog.")
     # Path of the XML file
-    xml_file = 'C:/Users/dande/Downloads/LPIV/Myxml.xml'
-    
+    parser.add_argument("xml_file", nargs="?", default='C:/Users/dande/Downloads/LPIV/Myxml.xml')
+    parser.add_argument("--stream", action="store_true", help="Read the file incrementally (for very large catalogs).")
+    # Query options (answered from the persisted indexes)
+    parser.add_argument("--author")
+    parser.add_argument("--genre")
+    parser.add_argument("--min-price", type=float)
+    parser.add_argument("--max-price", type=float)
+    parser.add_argument("--after", help="Published on or after this date (YYYY-MM-DD).")
+    parser.add_argument("--before", help="Published on or before this date (YYYY-MM-DD).")
+    args = parser.parse_args()
+
+    filters = dict(author=args.author, genre=args.genre, min_price=args.min_price, max_price=args.max_price,
+                   published_after=args.after, published_before=args.before)
+    if any(value is not None for value in filters.values()):
+        query_and_display_xml(args.xml_file, **filters)
+        return
+
     # Call the parsing function
-    parse_and_display_xml(xml_file)
+    parse_and_display_xml(args.xml_file, stream=args.stream)
 
 
 # Run the program